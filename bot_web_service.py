@@ -2,11 +2,13 @@
 Servicio Web principal para Render.com
 Incluye tanto la API de health check como el bot de trading
 """
+import functools
 import logging
 import sys
 import os
 import threading
 import time
+import shutil
 import signal
 
 # Configuración de logging
@@ -23,12 +25,14 @@ if current_dir not in sys.path:
 
 # Importar HealthCheckAPI con manejo de errores
 try:
-    from health_check import HealthCheckAPI
+    from health_check import HealthCheckAPI, get_health_check_api, stop_logging
     logger.info("✅ HealthCheckAPI importado correctamente")
 except ImportError as e:
     logger.error(f"❌ Error importando HealthCheckAPI: {e}")
     logger.error("Asegúrate de que health_check.py esté en el mismo directorio")
     HealthCheckAPI = None
+    get_health_check_api = None
+    stop_logging = None
 
 # Importar el bot de trading con manejo de errores
 try:
@@ -72,7 +76,8 @@ class TradingBotService:
         """Inicializa la API de health check"""
         try:
             if HealthCheckAPI:
-                self.health_api = HealthCheckAPI()
+                # Reutilizar la instancia compartida en lugar de construir otra app Flask
+                self.health_api = get_health_check_api()
                 logger.info("🏥 Health Check API inicializada")
             else:
                 logger.warning("⚠️ HealthCheckAPI no disponible")
@@ -222,6 +227,9 @@ def create_app():
     try:
         if service is None:
             service = TradingBotService()
+            # Mismas comprobaciones de arranque que run() (gunicorn no pasa por run())
+            if not service.test_connections():
+                logger.warning("⚠️ Continuando con conexiones limitadas")
         return service.get_app()
     except Exception as e:
         logger.error(f"❌ Error creando aplicación: {e}")
@@ -235,11 +243,37 @@ def create_app():
         
         return app
 
-# Aplicación principal
-app = create_app()
+def _exec_gunicorn():
+    """
+    Reemplaza el proceso actual por gunicorn; retorna si gunicorn no está instalado.
+    Debe llamarse antes de construir cualquier servicio: execv no ejecuta atexit.
+    """
+    gunicorn_path = shutil.which('gunicorn')
+    if not gunicorn_path:
+        logger.warning("⚠️ gunicorn no encontrado, usando servidor de desarrollo de Flask")
+        return
+    config_path = os.path.join(current_dir, 'gunicorn.conf.py')
+    logger.info("🚀 Iniciando gunicorn con workers gevent...")
+    # Vaciar la cola de logs: el hilo del listener no sobrevive al execv
+    if stop_logging is not None:
+        stop_logging()
+    os.execv(gunicorn_path, [gunicorn_path, '-c', config_path, '--chdir', current_dir, 'bot_web_service:app'])
+
+# Aplicación principal (creada en el primer acceso, p. ej. cuando gunicorn la carga)
+_get_app = functools.lru_cache(maxsize=1)(create_app)
+
+def __getattr__(name: str):
+    """Acceso perezoso (PEP 562) a `app` para gunicorn"""
+    if name == 'app':
+        return _get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == '__main__':
     try:
+        # En producción delegar en gunicorn (workers gevent, ver gunicorn.conf.py)
+        # antes de construir ningún servicio
+        if os.environ.get('ENVIRONMENT') == 'production':
+            _exec_gunicorn()
         service_instance = TradingBotService()
         service_instance.run()
     except KeyboardInterrupt:
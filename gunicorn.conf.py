@@ -0,0 +1,26 @@
+"""
+Configuración de Gunicorn para Render.com
+Uso: gunicorn -c gunicorn.conf.py bot_web_service:app
+También la carga health_check.run_server para el servidor embebido.
+
+Workers asíncronos (gevent) para que los probes de /health y /ready no queden
+encolados detrás de requests lentas; fallback a gthread si gevent no está.
+
+Un único worker: cada worker construye su propio TradingBotService y con más de
+uno el bot operaría (y notificaría) por duplicado. La concurrencia la dan las
+conexiones gevent / threads, no los procesos.
+"""
+import importlib.util
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+workers = 1
+timeout = 30
+graceful_timeout = 10
+
+if importlib.util.find_spec('gevent') is not None:
+    worker_class = 'gevent'
+    worker_connections = 1000
+else:
+    worker_class = 'gthread'
+    threads = 8
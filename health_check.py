@@ -2,12 +2,18 @@
 Health Check API para Render.com
 Maneja endpoints de salud del servicio y estado del bot de trading
 """
+import atexit
+import functools
 import logging
+import logging.handlers
+import queue
+import runpy
 import time
 import json
 import os
 import sys
 from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
 # Configuración de logging
@@ -15,15 +21,150 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+
+def _setup_queue_logging():
+    """
+    Mueve la escritura de logs fuera del hilo de la request.
+    
+    Los handlers del root logger pasan a un QueueListener que escribe desde su
+    propio hilo; en el root solo queda un QueueHandler (un put en la cola).
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        return None
+
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+    queue_handler = logging.handlers.QueueHandler(queue.Queue(-1))
+    root.addHandler(queue_handler)
+
+    def start_listener():
+        global _log_listener
+        listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        _log_listener = listener
+        return listener
+
+    # El hilo del listener no sobrevive a un fork (workers de gunicorn):
+    # se vacía la cola antes del fork y el hijo usa una cola y un listener nuevos
+    def drain_before_fork():
+        deadline = time.monotonic() + 0.5
+        while queue_handler.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def restart_in_child():
+        queue_handler.queue = queue.Queue(-1)
+        start_listener()
+
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(before=drain_before_fork, after_in_child=restart_in_child)
+    return start_listener()
+
+_log_listener = None
+_setup_queue_logging()
 logger = logging.getLogger(__name__)
 
+def stop_logging() -> None:
+    """
+    Vacía la cola de logs y detiene el hilo del listener.
+    Necesario antes de un execv: el hilo no sobrevive y atexit no se ejecuta.
+    """
+    global _log_listener
+    listener, _log_listener = _log_listener, None
+    if listener is not None:
+        atexit.unregister(listener.stop)
+        listener.stop()
+
+try:
+    import orjson
+except ImportError:
+    # orjson es opcional: se usa json estándar como fallback
+    orjson = None
+
+# Marcadores de los campos variables dentro de las respuestas pre-serializadas
+TIMESTAMP_PLACEHOLDER = b'__TS__'
+UPTIME_PLACEHOLDER = b'"__UPTIME__"'
+
+# Configuración compartida de gunicorn (workers, timeouts)
+GUNICORN_CONF_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+
+# Uptime mínimo (segundos) antes de reportar readiness
+READY_MIN_UPTIME = 5.0
+
+# Segundos que se reutiliza una lectura de psutil (ráfagas de /metrics)
+METRICS_CACHE_TTL = 5.0
+
+# (epoch en segundos, ISO) del último timestamp formateado
+_iso_cache = (0, '')
+
+def _iso_now() -> str:
+    """Timestamp ISO con resolución de segundos; solo se formatea cuando cambia el segundo"""
+    global _iso_cache
+    now = int(time.time())
+    cached = _iso_cache
+    if cached[0] != now:
+        cached = _iso_cache = (now, datetime.fromtimestamp(now).isoformat())
+    return cached[1]
+
+def _json_bytes(payload: Any) -> bytes:
+    """Serializa un payload a JSON compacto en bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def _make_orjson_provider(app):
+    """Crea un JSON provider de Flask que serializa con orjson"""
+    from flask.json.provider import DefaultJSONProvider
+
+    class OrjsonProvider(DefaultJSONProvider):
+        """JSON provider respaldado por orjson (mismo `default` que el provider estándar)"""
+        def _option(self) -> int:
+            return orjson.OPT_SORT_KEYS if self.sort_keys else 0
+
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return orjson.dumps(obj, default=self.default, option=self._option()).decode('utf-8')
+
+        def loads(self, s, **kwargs: Any) -> Any:
+            return orjson.loads(s)
+
+        def response(self, *args: Any, **kwargs: Any):
+            obj = self._prepare_response_obj(args, kwargs)
+            body = orjson.dumps(obj, default=self.default, option=self._option())
+            return self._app.response_class(body, mimetype=self.mimetype)
+
+    return OrjsonProvider(app)
+
 class HealthCheckAPI:
     """API de Health Check para Render.com con información del bot de trading"""
+    # Endpoints publicados (solo lectura: compartido entre respuestas)
+    _ENDPOINTS = MappingProxyType({
+        'health': '/health',
+        'healthz': '/healthz',
+        'status': '/status',
+        'trading_bot': '/trading-bot',
+        'ready': '/ready',
+        'metrics': '/metrics',
+        'info': '/info'
+    })
+
     def __init__(self):
         """Inicializa la API de health check"""
         try:
             self.app = self._create_flask_app()
-            self.start_time = time.time()
+            # Reloj monotónico para el uptime; hora de inicio en ISO calculada una sola vez
+            self._start_monotonic = time.monotonic()
+            self._ready = False
+            self._ready_at = self._start_monotonic + READY_MIN_UPTIME
+            self._start_wall_iso = datetime.now().isoformat(timespec='seconds')
+            self._prime_cpu_percent()
+            self._system_info_cached = self._build_system_info()
+            self._build_static_payloads()
+            # Cache de respuestas: endpoint -> (expiración monotónica, body, status)
+            self._response_cache = {}
+            # Cache de checks costosos: nombre -> (expiración monotónica, resultado)
+            self._check_cache = {}
             self.setup_routes()
             # Estado del bot de trading
             self.trading_bot_status = {
@@ -32,6 +173,7 @@ class HealthCheckAPI:
                 'last_update': None,
                 'error': None
             }
+            self._ready = True
             logger.info("🏥 HealthCheckAPI inicializada correctamente")
         except Exception as e:
             logger.error(f"❌ Error inicializando HealthCheckAPI: {e}")
@@ -40,14 +182,129 @@ class HealthCheckAPI:
     def _create_flask_app(self):
         """Crea la instancia de Flask"""
         try:
-            from flask import Flask, jsonify
+            from flask import Flask, jsonify, g, has_request_context, request
             # Hacer jsonify disponible para toda la clase
             self.jsonify = jsonify
-            return Flask(__name__)
+            self._request = request
+            self._request_g = g
+            self._has_request_context = has_request_context
+            app = Flask(__name__)
+            # Serializar jsonify con orjson cuando está disponible
+            if orjson is not None:
+                app.json = _make_orjson_provider(app)
+            # JSON compacto y sin ordenar claves (las claves de config aplican a Flask < 2.3)
+            app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
+            app.config['JSON_SORT_KEYS'] = False
+            app.json.sort_keys = False
+            app.json.compact = True
+            return app
         except ImportError as e:
             logger.error(f"❌ Error importando Flask: {e}")
             raise ImportError("Flask no está disponible. Instala con: pip install flask")
 
+    def _prime_cpu_percent(self):
+        """Inicializa psutil.cpu_percent para que las lecturas posteriores no bloqueen"""
+        try:
+            import psutil
+            psutil.cpu_percent(interval=None)
+        except ImportError:
+            pass
+
+    def _build_static_payloads(self):
+        """Pre-serializa los payloads de `/`, `/info`, `/health` y `/ready` (solo cambian timestamp y uptime)"""
+        timestamp = TIMESTAMP_PLACEHOLDER.decode()
+        self._info_template = _json_bytes({
+            **self._system_info_cached,
+            'timestamp': timestamp
+        })
+        # Una plantilla por combinación de (available, running) del trading bot
+        self._index_templates = {
+            (available, running): _json_bytes({
+                'service': 'Trading Bot Demo EMAS',
+                'version': '1.0.0',
+                'status': 'running',
+                'timestamp': timestamp,
+                'trading_bot': {
+                    'available': available,
+                    'running': running
+                },
+                'endpoints': list(self._ENDPOINTS.values())
+            })
+            for available in (False, True)
+            for running in (False, True)
+        }
+
+        # /health: una plantilla según la disponibilidad del trading bot (único componente variable)
+        self._health_templates = {
+            available: _json_bytes({
+                'status': 'healthy' if available else 'degraded',
+                'timestamp': timestamp,
+                'uptime_seconds': UPTIME_PLACEHOLDER.strip(b'"').decode(),
+                'components': {
+                    'api': True,
+                    'flask': True,
+                    'trading_bot': available
+                },
+                'version': '1.0.0'
+            })
+            for available in (False, True)
+        }
+
+        # /ready: solo cambia el timestamp
+        self._ready_templates = {
+            ready: _json_bytes({
+                'ready': ready,
+                'timestamp': timestamp
+            })
+            for ready in (False, True)
+        }
+
+    def _render_health(self):
+        """Renderiza /health desde la plantilla pre-serializada; devuelve (response, status)"""
+        available = bool(self.trading_bot_status.get('available', False))
+        uptime = time.monotonic() - self._start_monotonic
+        body = self._health_templates[available].replace(
+            UPTIME_PLACEHOLDER, str(round(uptime, 2)).encode()
+        ).replace(TIMESTAMP_PLACEHOLDER, self._now_iso().encode())
+        status_code = 200 if available else 503
+        return self.app.response_class(body, mimetype='application/json'), status_code
+
+    def _render_template(self, template: bytes):
+        """Devuelve una plantilla pre-serializada con el timestamp de la request"""
+        body = template.replace(TIMESTAMP_PLACEHOLDER, self._now_iso().encode())
+        return self.app.response_class(body, mimetype='application/json')
+
+    def _json(self, payload: Any, status: int = 200):
+        """Respuesta JSON serializada directamente, sin pasar por jsonify"""
+        return self.app.response_class(_json_bytes(payload), status=status, mimetype='application/json')
+
+    def _cached_response(self, ttl: float):
+        """Decorador que cachea la respuesta de un endpoint idempotente durante `ttl` segundos"""
+        def decorator(handler):
+            key = handler.__name__
+
+            @functools.wraps(handler)
+            def wrapper():
+                now = time.monotonic()
+                entry = None if self._request.args.get('force') == '1' else self._response_cache.get(key)
+                if entry is not None and entry[0] > now:
+                    return self.app.response_class(entry[1], status=entry[2], mimetype='application/json')
+                response = self.app.make_response(handler())
+                # No se cachean errores internos
+                if response.status_code < 500:
+                    self._response_cache[key] = (now + ttl, response.get_data(), response.status_code)
+                return response
+            return wrapper
+        return decorator
+
+    def _now_iso(self) -> str:
+        """Timestamp ISO de la request actual (calculado una sola vez por request)"""
+        if self._has_request_context():
+            now_iso = self._request_g.get('now_iso')
+            if now_iso is not None:
+                return now_iso
+        return _iso_now()
+
     def update_trading_bot_status(self, status: Dict[str, Any]):
         """Actualiza el estado del bot de trading"""
         try:
@@ -57,98 +314,143 @@ class HealthCheckAPI:
                 'last_update': datetime.now().isoformat(),
                 'error': status.get('error')
             })
-            logger.debug(f"🔄 Estado del trading bot actualizado: {self.trading_bot_status}")
+            # El estado cambió: invalidar respuestas cacheadas
+            self._response_cache.clear()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔄 Estado del trading bot actualizado: %s", self.trading_bot_status)
         except Exception as e:
             logger.error(f"❌ Error actualizando estado del trading bot: {e}")
 
     def setup_routes(self):
         """Configura las rutas de la API"""
-        @self.app.route('/health', methods=['GET'])
+        # Métodos ligados como locales: evita lookups de atributos en cada request
+        request_g = self._request_g
+        request = self._request
+        json_response = self._json
+        now_iso = self._now_iso
+        render_template = self._render_template
+        render_health = self._render_health
+        ready_templates = self._ready_templates
+        get_detailed_status = self.get_detailed_status
+        get_trading_bot_status = self.get_trading_bot_status
+        get_metrics = self.get_metrics
+        is_ready = self.is_ready
+        route = self.app.route
+
+        def is_forced() -> bool:
+            """`?force=1` invalida los caches del endpoint"""
+            return request.args.get('force') == '1'
+
+        @self.app.before_request
+        def stamp_request():
+            """Calcula el timestamp una sola vez por request"""
+            request_g.now_iso = _iso_now()
+
+        @route('/', methods=['GET'], strict_slashes=False)
+        def index():
+            """Endpoint raíz con el resumen del servicio"""
+            try:
+                template = self._index_templates[(
+                    bool(self.trading_bot_status.get('available')),
+                    bool(self.trading_bot_status.get('running'))
+                )]
+                return render_template(template)
+            except Exception as e:
+                logger.error(f"❌ Error en index: {e}")
+                return json_response({
+                    'error': str(e),
+                    'timestamp': now_iso()
+                }, 500)
+
+        @route('/health', methods=['GET'], strict_slashes=False)
+        @self._cached_response(ttl=1.0)
         def health_check():
             """Endpoint principal de health check"""
             try:
-                health_status = self.get_health_status()
-                status_code = 200 if health_status['status'] == 'healthy' else 503
-                return self.jsonify(health_status), status_code
+                return render_health()
             except Exception as e:
                 logger.error(f"❌ Error en health check: {e}")
-                return self.jsonify({
+                return json_response({
                     'status': 'error',
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                }), 500
+                    'timestamp': now_iso()
+                }, 500)
+
+        @route('/healthz', methods=['GET'], strict_slashes=False)
+        def healthz():
+            """Probe liviano para Render: sin body, solo el código de estado"""
+            return ('', 204) if is_ready() else ('', 503)
 
-        @self.app.route('/status', methods=['GET'])
+        @route('/status', methods=['GET'], strict_slashes=False)
         def status():
             """Endpoint de estado detallado"""
             try:
-                return self.jsonify(self.get_detailed_status())
+                return json_response(get_detailed_status())
             except Exception as e:
                 logger.error(f"❌ Error en status detallado: {e}")
-                return self.jsonify({
+                return json_response({
                     'status': 'error',
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                }), 500
+                    'timestamp': now_iso()
+                }, 500)
 
-        @self.app.route('/trading-bot', methods=['GET'])
+        @route('/trading-bot', methods=['GET'], strict_slashes=False)
         def trading_bot_status():
             """Endpoint específico para el estado del bot de trading"""
             try:
-                return self.jsonify(self.get_trading_bot_status())
+                return json_response(get_trading_bot_status())
             except Exception as e:
                 logger.error(f"❌ Error obteniendo estado del trading bot: {e}")
-                return self.jsonify({
+                return json_response({
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                }), 500
+                    'timestamp': now_iso()
+                }, 500)
 
-        @self.app.route('/ready', methods=['GET'])
+        @route('/ready', methods=['GET'], strict_slashes=False)
+        @self._cached_response(ttl=0.5)
         def readiness_check():
             """Check de readiness para Kubernetes/Render"""
             try:
-                ready = self.is_ready()
-                status_code = 200 if ready else 503
-                return self.jsonify({
-                    'ready': ready,
-                    'timestamp': datetime.now().isoformat()
-                }), status_code
+                ready = is_ready()
+                return render_template(ready_templates[ready]), 200 if ready else 503
             except Exception as e:
                 logger.error(f"❌ Error en readiness check: {e}")
-                return self.jsonify({
+                return json_response({
                     'ready': False,
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                }), 500
+                    'timestamp': now_iso()
+                }, 500)
 
-        @self.app.route('/metrics', methods=['GET'])
+        @route('/metrics', methods=['GET'], strict_slashes=False)
         def metrics():
             """Endpoint de métricas"""
             try:
-                return self.jsonify(self.get_metrics())
+                return json_response(get_metrics(force=is_forced()))
             except Exception as e:
                 logger.error(f"❌ Error obteniendo métricas: {e}")
-                return self.jsonify({
+                return json_response({
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                }), 500
+                    'timestamp': now_iso()
+                }, 500)
 
-        @self.app.route('/info', methods=['GET'])
+        @route('/info', methods=['GET'], strict_slashes=False)
+        @self._cached_response(ttl=60.0)
         def info():
             """Información del sistema"""
             try:
-                return self.jsonify(self.get_system_info())
+                return render_template(self._info_template)
             except Exception as e:
                 logger.error(f"❌ Error obteniendo info del sistema: {e}")
-                return self.jsonify({
+                return json_response({
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                }), 500
+                    'timestamp': now_iso()
+                }, 500)
 
-    def get_health_status(self) -> Dict[str, Any]:
+    def get_health_status(self, now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Obtiene el estado general de salud"""
+        now_iso = now_iso or self._now_iso()
         try:
-            uptime = time.time() - self.start_time
+            uptime = time.monotonic() - self._start_monotonic
             
             # Verificar componentes básicos
             components = {
@@ -162,7 +464,7 @@ class HealthCheckAPI:
             
             return {
                 'status': 'healthy' if all_healthy else 'degraded',
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'uptime_seconds': round(uptime, 2),
                 'components': components,
                 'version': '1.0.0'
@@ -172,18 +474,20 @@ class HealthCheckAPI:
             return {
                 'status': 'error',
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
 
-    def get_detailed_status(self) -> Dict[str, Any]:
+    def get_detailed_status(self, now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Obtiene estado detallado del sistema"""
+        now_iso = now_iso or self._now_iso()
         try:
-            uptime = time.time() - self.start_time
+            uptime = time.monotonic() - self._start_monotonic
             
             return {
                 'status': 'running',
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'uptime': {
+                    'started_at': self._start_wall_iso,
                     'seconds': round(uptime, 2),
                     'formatted': self._format_uptime(uptime)
                 },
@@ -194,89 +498,96 @@ class HealthCheckAPI:
                 },
                 'trading_bot': self.trading_bot_status,
                 'system': self.get_system_info(),
-                'endpoints': {
-                    'health': '/health',
-                    'status': '/status',
-                    'trading_bot': '/trading-bot',
-                    'ready': '/ready',
-                    'metrics': '/metrics',
-                    'info': '/info'
-                }
+                'endpoints': dict(self._ENDPOINTS)
             }
         except Exception as e:
             logger.error(f"❌ Error obteniendo status detallado: {e}")
             return {
                 'status': 'error',
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
 
-    def get_trading_bot_status(self) -> Dict[str, Any]:
+    def get_trading_bot_status(self, now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Obtiene estado específico del bot de trading"""
+        now_iso = now_iso or self._now_iso()
         try:
             return {
                 'trading_bot': self.trading_bot_status,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
         except Exception as e:
             logger.error(f"❌ Error obteniendo status del trading bot: {e}")
             return {
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
 
     def is_ready(self) -> bool:
-        """Verifica si el servicio está listo para recibir tráfico"""
-        try:
-            # Verificar que Flask esté funcionando
-            if not hasattr(self, 'app') or self.app is None:
-                return False
-            
-            # Verificar uptime mínimo (al menos 5 segundos)
-            uptime = time.time() - self.start_time
-            if uptime < 5:
-                return False
-            
-            return True
-        except Exception as e:
-            logger.error(f"❌ Error en readiness check: {e}")
-            return False
+        """Verifica si el servicio está listo para recibir tráfico (sin I/O ni dicts)"""
+        # Listo cuando terminó el bootstrap y pasó el uptime mínimo de READY_MIN_UPTIME
+        return self._ready and time.monotonic() >= self._ready_at
 
-    def get_metrics(self) -> Dict[str, Any]:
-        """Obtiene métricas del sistema"""
+    def _cached(self, name: str, fn, ttl: float):
+        """Devuelve el resultado de `fn` cacheado durante `ttl` segundos bajo la clave `name`"""
+        now = time.monotonic()
+        entry = self._check_cache.get(name)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        result = fn()
+        self._check_cache[name] = (now + ttl, result)
+        return result
+
+    def _collect_psutil_metrics(self) -> Dict[str, Any]:
+        """Recolecta métricas de psutil (lanza ImportError si psutil no está instalado)"""
+        import psutil
+        
+        # Un solo snapshot de memoria y disco
+        vm = psutil.virtual_memory()
+        du = psutil.disk_usage('/')
+        
+        return {
+            # No bloqueante: delta desde la llamada anterior (inicializado en __init__)
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory': {
+                'percent': vm.percent,
+                'available': vm.available,
+                'total': vm.total
+            },
+            'disk': {
+                'percent': du.percent,
+                'free': du.free,
+                'total': du.total
+            },
+            'processes': len(psutil.pids())
+        }
+
+    def get_metrics(self, now_iso: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+        """Obtiene métricas del sistema (cacheadas METRICS_CACHE_TTL segundos salvo `force`)"""
+        now_iso = now_iso or self._now_iso()
         try:
-            import psutil
-            
+            if force:
+                self._check_cache.pop('psutil', None)
+            metrics = self._cached('psutil', self._collect_psutil_metrics, METRICS_CACHE_TTL)
             return {
-                'timestamp': datetime.now().isoformat(),
-                'cpu_percent': psutil.cpu_percent(interval=1),
-                'memory': {
-                    'percent': psutil.virtual_memory().percent,
-                    'available': psutil.virtual_memory().available,
-                    'total': psutil.virtual_memory().total
-                },
-                'disk': {
-                    'percent': psutil.disk_usage('/').percent,
-                    'free': psutil.disk_usage('/').free,
-                    'total': psutil.disk_usage('/').total
-                },
-                'processes': len(psutil.pids())
+                'timestamp': now_iso,
+                **metrics
             }
         except ImportError:
             logger.warning("⚠️ psutil no disponible, métricas limitadas")
             return {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'note': 'psutil no disponible'
             }
         except Exception as e:
             logger.error(f"❌ Error obteniendo métricas: {e}")
             return {
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
 
-    def get_system_info(self) -> Dict[str, Any]:
-        """Obtiene información del sistema"""
+    def _build_system_info(self) -> Dict[str, Any]:
+        """Construye la información del sistema (invariante durante la vida del proceso)"""
         try:
             return {
                 'platform': sys.platform,
@@ -291,17 +602,20 @@ class HealthCheckAPI:
         except Exception as e:
             logger.error(f"❌ Error obteniendo info del sistema: {e}")
             return {
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'error': str(e)
             }
 
+    def get_system_info(self) -> Dict[str, Any]:
+        """Obtiene información del sistema (calculada una vez en __init__)"""
+        return self._system_info_cached
+
     def _format_uptime(self, uptime_seconds: float) -> str:
         """Formatea el uptime en formato legible"""
         try:
-            days = int(uptime_seconds // 86400)
-            hours = int((uptime_seconds % 86400) // 3600)
-            minutes = int((uptime_seconds % 3600) // 60)
-            seconds = int(uptime_seconds % 60)
+            total = int(uptime_seconds)
+            days, resto = divmod(total, 86400)
+            hours, resto = divmod(resto, 3600)
+            minutes, seconds = divmod(resto, 60)
             
             parts = []
             if days > 0:
@@ -318,14 +632,60 @@ class HealthCheckAPI:
             return f"{uptime_seconds:.2f}s"
 
 # Instancia global de la API
-health_api = None
-
+@functools.lru_cache(maxsize=1)
 def get_health_check_api():
-    """Obtiene la instancia global de HealthCheckAPI"""
-    global health_api
-    if health_api is None:
-        health_api = HealthCheckAPI()
-    return health_api
+    """Obtiene la instancia global de HealthCheckAPI (creada en el primer uso)"""
+    return HealthCheckAPI()
+
+def __getattr__(name: str):
+    """Acceso perezoso (PEP 562) a `health_check_api` y `app` para gunicorn"""
+    if name == 'health_check_api':
+        return get_health_check_api()
+    if name == 'app':
+        return get_health_check_api().app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def run_server(app, host: str = '0.0.0.0', port: int = 5000, workers: Optional[int] = None):
+    """
+    Ejecuta la app con gunicorn y workers gevent en lugar del servidor de desarrollo.
+    
+    La configuración de workers sale de gunicorn.conf.py (la misma que usa
+    bot_web_service en producción); aquí solo se sobrescribe bind, y workers
+    únicamente si se indica explícitamente.
+    Los handlers solo hacen I/O de la librería estándar (os, time, lecturas de
+    /proc vía psutil), que gevent parchea, por lo que la app es segura con
+    monkey-patching. Si no hay gunicorn se recurre a app.run().
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        logger.warning("⚠️ gunicorn no disponible, usando servidor de desarrollo de Flask")
+        app.run(host=host, port=port, debug=False)
+        return
+
+    class GunicornApplication(BaseApplication):
+        """Aplicación gunicorn embebida que sirve una app WSGI ya construida"""
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            # Mismo criterio que `gunicorn -c`: toda variable del archivo que sea un setting
+            file_config = runpy.run_path(GUNICORN_CONF_FILE)
+            for key, value in file_config.items():
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key, value)
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {'bind': f'{host}:{port}'}
+    if workers is not None:
+        options['workers'] = workers
+    GunicornApplication(app, options).run()
 
 if __name__ == '__main__':
     # Script de prueba
@@ -335,15 +695,16 @@ if __name__ == '__main__':
         api = HealthCheckAPI()
         print("✅ HealthCheckAPI creada correctamente")
         print(f"🏥 Health: http://localhost:5000/health")
+        print(f"💓 Probe: http://localhost:5000/healthz")
         print(f"📊 Status: http://localhost:5000/status")
         print(f"🤖 Trading Bot: http://localhost:5000/trading-bot")
         print(f"📈 Metrics: http://localhost:5000/metrics")
         print(f"ℹ️ Info: http://localhost:5000/info")
         print(f"✅ Ready: http://localhost:5000/ready")
         
-        # Ejecutar en modo desarrollo
-        print("\n🚀 Iniciando servidor de desarrollo...")
-        api.app.run(host='0.0.0.0', port=5000, debug=True)
+        # Ejecutar con gunicorn (workers gevent)
+        print("\n🚀 Iniciando servidor gunicorn...")
+        run_server(api.app, host='0.0.0.0', port=5000)
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -3,13 +3,14 @@ Cliente para la API de Binance
 Maneja todas las conexiones con la API de Binance con manejo de errores robusto
 """
 
+import functools
 import requests
 import time
 import logging
 from typing import Dict, List, Optional, Any, Tuple
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
-from ..config.settings import *
+from ..config.settings import BINANCE_BASE_URL, API_TIMEOUT, MAX_RETRIES, RETRY_DELAY, API_POOL_MAXSIZE
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +47,12 @@ class BinanceClient:
                 allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
             )
             
-            adapter = HTTPAdapter(max_retries=retry_strategy)
+            # Pool compartido: las requests en paralelo reutilizan conexiones TLS abiertas
+            adapter = HTTPAdapter(
+                max_retries=retry_strategy,
+                pool_connections=16,
+                pool_maxsize=API_POOL_MAXSIZE
+            )
             session.mount("http://", adapter)
             session.mount("https://", adapter)
             
@@ -225,9 +231,8 @@ class BinanceClient:
         except Exception as e:
             logger.error(f"❌ Error cerrando sesión: {e}")
 
-# Instancia global del cliente
-binance_client = BinanceClient()
-
+# Instancia global del cliente (creada en el primer uso, no al importar)
+@functools.lru_cache(maxsize=1)
 def get_binance_client() -> BinanceClient:
     """Obtiene la instancia global del cliente de Binance"""
-    return binance_client
+    return BinanceClient()
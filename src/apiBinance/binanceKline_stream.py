@@ -0,0 +1,180 @@
+"""
+Stream de Klines por WebSocket
+Mantiene en memoria las últimas velas de cada (símbolo, intervalo) actualizadas por push desde Binance
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from ..config.settings import BINANCE_WS_URL
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+class KlineStream:
+    """Suscripción a streams `<symbol>@kline_<interval>` con buffer circular por par"""
+
+    def __init__(self, symbols: Iterable[str], intervals: Iterable[str], buffer_size: int = 1000):
+        """
+        Inicializa el stream (no conecta hasta llamar a start)
+
+        Args:
+            symbols: Símbolos a seguir (ej: BTCUSDT)
+            intervals: Intervalos a seguir (ej: 1m, 5m)
+            buffer_size: Velas máximas guardadas por par
+        """
+        self.buffer_size = buffer_size
+        self._buffers: Dict[Tuple[str, str], Deque[List]] = {
+            (symbol.upper(), interval): deque(maxlen=buffer_size)
+            for symbol in symbols
+            for interval in intervals
+        }
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.connected = False
+        self.message_count = 0
+
+        logger.info(f"📡 KlineStream preparado para {len(self._buffers)} pares")
+
+    @staticmethod
+    def is_available() -> bool:
+        """Indica si la librería websockets está instalada"""
+        return websockets is not None
+
+    def _stream_url(self) -> str:
+        """URL del stream combinado para todos los pares"""
+        streams = '/'.join(f"{symbol.lower()}@kline_{interval}" for symbol, interval in self._buffers)
+        return f"{BINANCE_WS_URL}/stream?streams={streams}"
+
+    def start(self) -> bool:
+        """Arranca el hilo del WebSocket; retorna False si no es posible"""
+        if not self.is_available():
+            logger.warning("⚠️ websockets no instalado - klines solo por REST")
+            return False
+        if not self._buffers:
+            return False
+        if self._thread and self._thread.is_alive():
+            return True
+
+        self._thread = threading.Thread(target=self._run_loop, name='KlineStream', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Detiene el stream y espera al hilo"""
+        if self._loop and self._stop_event:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.connected = False
+        logger.info("🛑 KlineStream detenido")
+
+    def _run_loop(self) -> None:
+        """Punto de entrada del hilo: loop asyncio propio"""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._listen())
+        finally:
+            self._loop.close()
+
+    async def _listen(self) -> None:
+        """Conecta, consume mensajes y reconecta con backoff"""
+        self._stop_event = asyncio.Event()
+        backoff = 1
+
+        while not self._stop_event.is_set():
+            try:
+                async with websockets.connect(self._stream_url(), ping_interval=20) as ws:
+                    # Tras una reconexión puede faltar un hueco de velas: forzar re-seed por REST
+                    with self._lock:
+                        for buffer in self._buffers.values():
+                            buffer.clear()
+                    self.connected = True
+                    backoff = 1
+                    logger.info("✅ KlineStream conectado")
+
+                    while not self._stop_event.is_set():
+                        try:
+                            raw = await asyncio.wait_for(ws.recv(), timeout=1)
+                        except asyncio.TimeoutError:
+                            continue
+                        self._handle_message(raw)
+
+            except Exception as e:
+                logger.warning(f"⚠️ KlineStream desconectado: {e} - reintentando en {backoff}s")
+
+            self.connected = False
+            if self._stop_event.is_set():
+                break
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, 60)
+
+    def _handle_message(self, raw) -> None:
+        """Aplica un evento kline al buffer del par correspondiente"""
+        try:
+            k = json.loads(raw)['data']['k']
+        except (ValueError, KeyError, TypeError):
+            return
+
+        # Mismo formato que /api/v3/klines
+        row = [k['t'], k['o'], k['h'], k['l'], k['c'], k['v'], k['T'], k['q'], k['n'], k['V'], k['Q'], k['B']]
+
+        with self._lock:
+            buffer = self._buffers.get((k['s'], k['i']))
+            if buffer is None:
+                return
+            if buffer and buffer[-1][0] == row[0]:
+                buffer[-1] = row  # Actualización de la vela en curso
+            elif not buffer or row[0] > buffer[-1][0]:
+                buffer.append(row)
+            self.message_count += 1
+
+    def seed(self, symbol: str, interval: str, klines: List) -> None:
+        """Carga el histórico obtenido por REST conservando las velas más nuevas del stream"""
+        with self._lock:
+            buffer = self._buffers.get((symbol, interval))
+            if buffer is None or not klines:
+                return
+            last_open = klines[-1][0]
+            newer = [row for row in buffer if row[0] > last_open]
+            buffer.clear()
+            buffer.extend(klines)
+            buffer.extend(newer)
+
+    def get(self, symbol: str, interval: str, n: int) -> Optional[List]:
+        """Últimas `n` velas del par, o None si no hay suficientes o el stream está caído"""
+        if not self.connected:
+            return None
+        with self._lock:
+            buffer = self._buffers.get((symbol, interval))
+            if buffer is None or len(buffer) < n:
+                return None
+            return list(buffer)[-n:]
+
+    def tracks(self, symbol: str, interval: str) -> bool:
+        """Indica si el par está suscrito"""
+        return (symbol, interval) in self._buffers
+
+    def get_stats(self) -> Dict:
+        """Estadísticas del stream"""
+        with self._lock:
+            buffered = {f"{s}_{i}": len(b) for (s, i), b in self._buffers.items()}
+        return {
+            'connected': self.connected,
+            'messages': self.message_count,
+            'pairs': len(self._buffers),
+            'buffered_klines': buffered
+        }
@@ -3,38 +3,89 @@ Gestor de Datos de Mercado
 Maneja la obtención y procesamiento de datos de mercado desde Binance
 """
 
+import functools
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+import sys
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
 from .binance_client import get_binance_client
-from ..config.settings import *
+from .kline_stream import KlineStream
+from ..config.settings import API_WEIGHT_LIMIT, API_MAX_WORKERS
 
 logger = logging.getLogger(__name__)
 
+class RateLimiter:
+    """Token bucket por peso de request, compartido entre hilos"""
+    
+    def __init__(self, capacity: int = API_WEIGHT_LIMIT, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.refill_rate = capacity / period  # tokens por segundo
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, weight: int = 1) -> None:
+        """Bloquea hasta disponer de `weight` tokens"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate)
+                self._last_refill = now
+                if self._tokens >= weight:
+                    self._tokens -= weight
+                    return
+                wait = (weight - self._tokens) / self.refill_rate
+            time.sleep(wait)
+
+def _klines_weight(limit: int) -> int:
+    """Peso de /api/v3/klines según el límite solicitado"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    return 5
+
 class MarketDataManager:
     """Gestor de datos de mercado con manejo robusto de errores"""
     
     def __init__(self):
         """Inicializa el gestor de datos de mercado"""
         self.client = get_binance_client()
-        self.cache = {}
-        self.cache_expiry = {}
+        # clave -> (expira_en monotonic, datos), acotado por LRU
+        self.cache: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
         self.cache_duration = 30  # segundos
+        self.cache_maxsize = 512
+        self._cache_lock = threading.Lock()
+        self._key_cache: Dict[Tuple[str, str, int], str] = {}  # (symbol, interval, limit) -> clave interna
+        self.rate_limiter = RateLimiter()
+        self.kline_stream: Optional[KlineStream] = None
         
         logger.info("📊 MarketDataManager inicializado")
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Verifica si el cache es válido"""
-        if cache_key not in self.cache_expiry:
-            return False
-        
-        expiry_time = self.cache_expiry[cache_key]
-        return datetime.now() < expiry_time
+    def _get_cached(self, cache_key: str) -> Optional[Any]:
+        """Devuelve los datos cacheados si siguen vigentes, None si no"""
+        with self._cache_lock:
+            entry = self.cache.get(cache_key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self.cache[cache_key]
+                return None
+            self.cache.move_to_end(cache_key)
+            return entry[1]
     
     def _update_cache(self, cache_key: str, data: Any) -> None:
-        """Actualiza el cache con nuevos datos"""
-        self.cache[cache_key] = data
-        self.cache_expiry[cache_key] = datetime.now() + timedelta(seconds=self.cache_duration)
+        """Actualiza el cache con nuevos datos, descartando la entrada menos usada si está lleno"""
+        with self._cache_lock:
+            self.cache[cache_key] = (time.monotonic() + self.cache_duration, data)
+            self.cache.move_to_end(cache_key)
+            while len(self.cache) > self.cache_maxsize:
+                self.cache.popitem(last=False)
     
     def get_klines(self, symbol: str, interval: str, limit: int = 500) -> Optional[List]:
         """
@@ -49,12 +100,23 @@ class MarketDataManager:
             Lista de klines o None si hay error
         """
         try:
-            cache_key = f"klines_{symbol}_{interval}_{limit}"
+            key_args = (symbol, interval, limit)
+            cache_key = self._key_cache.get(key_args)
+            if cache_key is None:
+                cache_key = self._key_cache.setdefault(key_args, sys.intern(f"klines_{symbol}_{interval}_{limit}"))
+            
+            # Velas empujadas por WebSocket (si el stream está activo)
+            if self.kline_stream is not None:
+                streamed = self.kline_stream.get(symbol, interval, limit)
+                if streamed is not None:
+                    return streamed
             
             # Verificar cache
-            if self._is_cache_valid(cache_key) and cache_key in self.cache:
-                logger.debug(f"📦 Datos desde cache: {symbol} {interval}")
-                return self.cache[cache_key]
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📦 Datos desde cache: %s %s", symbol, interval)
+                return cached
             
             # Realizar request
             params = {
@@ -63,13 +125,19 @@ class MarketDataManager:
                 'limit': min(limit, 1000)  # Binance tiene límite de 1000
             }
             
-            logger.debug(f"🔄 Obteniendo klines: {symbol} {interval} ({limit})")
+            self.rate_limiter.acquire(_klines_weight(params['limit']))
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔄 Obteniendo klines: %s %s (%s)", symbol, interval, limit)
             
             result = self.client._make_request('GET', '/api/v3/klines', params=params)
             
             if result and isinstance(result, list) and len(result) > 0:
                 self._update_cache(cache_key, result)
-                logger.debug(f"✅ Klines obtenidos: {len(result)} velas")
+                if self.kline_stream is not None:
+                    self.kline_stream.seed(symbol, interval, result)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("✅ Klines obtenidos: %s velas", len(result))
                 return result
             else:
                 logger.warning(f"⚠️ No se pudieron obtener klines para {symbol} {interval}")
@@ -91,26 +159,20 @@ class MarketDataManager:
         Returns:
             Dict con datos procesados o None si hay error
         """
-        try:
-            # Obtener klines
-            klines = self.get_klines(symbol, timeframe, num_velas + 14)
-            if not klines or len(klines) < num_velas:
-                logger.warning(f"⚠️ Insuficientes klines para {symbol} {timeframe}")
-                return None
-            
-            # Procesar datos
-            datos = self._process_klines(klines, num_velas)
-            
-            if datos:
-                logger.debug(f"✅ Datos procesados para {symbol} {timeframe}")
-                return datos
-            else:
-                logger.warning(f"⚠️ Error procesando datos para {symbol} {timeframe}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ Error obteniendo datos de mercado {symbol}: {e}")
+        # get_klines y _process_klines ya capturan sus propios errores
+        klines = self.get_klines(symbol, timeframe, num_velas + 14)
+        if not klines or len(klines) < num_velas:
+            logger.warning(f"⚠️ Insuficientes klines para {symbol} {timeframe}")
             return None
+        
+        datos = self._process_klines(klines, num_velas)
+        if not datos:
+            logger.warning(f"⚠️ Error procesando datos para {symbol} {timeframe}")
+            return None
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("✅ Datos procesados para %s %s", symbol, timeframe)
+        return datos
     
     def _process_klines(self, klines: List, num_velas: int) -> Optional[Dict]:
         """
@@ -130,32 +192,19 @@ class MarketDataManager:
             # Tomar las últimas velas
             klines_to_process = klines[-num_velas:]
             
-            # Extraer datos OHLCV
-            maximos = []
-            minimos = []
-            cierres = []
-            tiempos = []
-            
-            for i, kline in enumerate(klines_to_process):
-                try:
-                    # kline format: [open_time, open_price, high_price, low_price, close_price, volume, ...]
-                    open_price = float(kline[1])
-                    high_price = float(kline[2])
-                    low_price = float(kline[3])
-                    close_price = float(kline[4])
-                    
-                    maximos.append(high_price)
-                    minimos.append(low_price)
-                    cierres.append(close_price)
-                    tiempos.append(i)
-                    
-                except (ValueError, IndexError) as e:
-                    logger.warning(f"⚠️ Error procesando kline: {e}")
-                    continue
-            
-            if len(maximos) < num_velas or len(minimos) < num_velas or len(cierres) < num_velas:
-                logger.warning(f"⚠️ Datos insuficientes después del procesamiento")
+            # Extraer datos OHLCV en bloque
+            # kline format: [open_time, open_price, high_price, low_price, close_price, volume, ...]
+            velas = np.asarray(klines_to_process, dtype=object)
+            if velas.ndim != 2 or velas.shape[1] < 5:
+                logger.warning(f"⚠️ Formato de klines inesperado: {velas.shape}")
                 return None
+            hlc = velas[:, 2:5].astype(np.float64)
+            
+            # Las estrategias recorren los datos vela a vela, así que se entregan como listas
+            maximos = hlc[:, 0].tolist()
+            minimos = hlc[:, 1].tolist()
+            cierres = hlc[:, 2].tolist()
+            tiempos = list(range(len(cierres)))
             
             precio_actual = cierres[-1] if cierres else 0
             
@@ -170,10 +219,39 @@ class MarketDataManager:
                 'timestamp': datetime.now().isoformat()
             }
             
+        except (ValueError, TypeError) as e:
+            # Precio no numérico en algún kline: se valida una sola vez en la conversión en bloque
+            logger.warning(f"⚠️ Error procesando klines: {e}")
+            return None
         except Exception as e:
             logger.error(f"❌ Error procesando klines: {e}")
             return None
     
+    def start_kline_stream(self, symbols: List[str], intervals: List[str]) -> bool:
+        """
+        Activa el stream de klines por WebSocket para los pares indicados
+        
+        El histórico se sigue cargando por REST en la primera llamada a get_klines;
+        a partir de ahí las velas llegan por push.
+        """
+        try:
+            if self.kline_stream is not None:
+                self.kline_stream.stop()
+            stream = KlineStream(symbols, intervals)
+            if not stream.start():
+                return False
+            self.kline_stream = stream
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error iniciando stream de klines: {e}")
+            return False
+    
+    def stop_kline_stream(self) -> None:
+        """Detiene el stream de klines si está activo"""
+        if self.kline_stream is not None:
+            self.kline_stream.stop()
+            self.kline_stream = None
+    
     def validate_symbol(self, symbol: str) -> bool:
         """Valida si un símbolo es válido"""
         try:
@@ -200,18 +278,16 @@ class MarketDataManager:
         try:
             logger.info(f"🔄 Obteniendo datos para {len(symbols)} símbolos ({timeframe})")
             
-            results = {}
-            for symbol in symbols:
+            def fetch(symbol: str):
                 try:
-                    datos = self.get_market_data(symbol, timeframe, num_velas)
-                    results[symbol] = datos
-                    
-                    # Pequeña pausa para no sobrecargar la API
-                    time.sleep(0.1)
-                    
+                    return symbol, self.get_market_data(symbol, timeframe, num_velas)
                 except Exception as e:
                     logger.warning(f"⚠️ Error obteniendo datos para {symbol}: {e}")
-                    results[symbol] = None
+                    return symbol, None
+            
+            # Requests en paralelo; el rate limiter respeta el peso por minuto de Binance
+            with ThreadPoolExecutor(max_workers=API_MAX_WORKERS) as executor:
+                results = dict(executor.map(fetch, symbols))
             
             successful = sum(1 for v in results.values() if v is not None)
             logger.info(f"✅ Datos obtenidos para {successful}/{len(symbols)} símbolos")
@@ -225,8 +301,8 @@ class MarketDataManager:
     def clear_cache(self) -> None:
         """Limpia el cache de datos"""
         try:
-            self.cache.clear()
-            self.cache_expiry.clear()
+            with self._cache_lock:
+                self.cache.clear()
             logger.info("🗑️ Cache de datos limpiado")
         except Exception as e:
             logger.error(f"❌ Error limpiando cache: {e}")
@@ -234,13 +310,16 @@ class MarketDataManager:
     def get_cache_stats(self) -> Dict[str, Any]:
         """Obtiene estadísticas del cache"""
         try:
-            current_time = datetime.now()
-            valid_entries = sum(1 for expiry in self.cache_expiry.values() if expiry > current_time)
+            current_time = time.monotonic()
+            with self._cache_lock:
+                total_entries = len(self.cache)
+                valid_entries = sum(1 for expiry, _ in self.cache.values() if expiry > current_time)
             
             return {
-                'total_entries': len(self.cache),
+                'total_entries': total_entries,
                 'valid_entries': valid_entries,
-                'expired_entries': len(self.cache) - valid_entries,
+                'expired_entries': total_entries - valid_entries,
+                'max_entries': self.cache_maxsize,
                 'cache_duration_seconds': self.cache_duration
             }
             
@@ -248,9 +327,8 @@ class MarketDataManager:
             logger.error(f"❌ Error obteniendo estadísticas del cache: {e}")
             return {}
 
-# Instancia global del gestor de datos de mercado
-market_data_manager = MarketDataManager()
-
+# Instancia global del gestor de datos de mercado (creada en el primer uso, no al importar)
+@functools.lru_cache(maxsize=1)
 def get_market_data_manager() -> MarketDataManager:
     """Obtiene la instancia global del gestor de datos de mercado"""
-    return market_data_manager
+    return MarketDataManager()
@@ -4,18 +4,75 @@ Gestor de Operaciones de Trading
 Código copiado íntegramente del archivo original
 """
 
+import atexit
 import csv
 import os
 import logging
 import statistics
+import sys
+import threading
+import time
+import numpy as np
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
-from ..config.settings import *
+from ..config.settings import ensure_data_dirs
 from ..bot.telegram_bot import get_telegram_bot
 
 logger = logging.getLogger(__name__)
 
+# Escritura del CSV por lotes: se vuelca al llegar a N filas o pasados T segundos
+CSV_BATCH_SIZE = 50
+CSV_FLUSH_INTERVAL = 5.0
+
+# Ventana de operaciones que se mantiene en memoria para el reporte semanal
+VENTANA_REPORTE = timedelta(days=7)
+
+# A partir de cuántas operaciones el reporte semanal usa reducciones de numpy
+REPORTE_NUMPY_MIN_OPS = 1000
+
+# Plantilla del reporte semanal (campos con nombre para str.format)
+_REPORTE_TEMPLATE = """
+━━━━━━━━━━━━━━━━━━━━
+📊 <b>REPORTE SEMANAL</b>
+━━━━━━━━━━━━━━━━━━━━
+📅 {fecha} | Últimos 7 días
+<b>RENDIMIENTO GENERAL</b>
+{emoji_resultado} PnL Total: <b>{pnl_total:+.2f}%</b>
+📈 Win Rate: <b>{winrate:.1f}%</b>
+✅ Ganadas: {wins} | ❌ Perdidas: {losses}
+<b>ESTADÍSTICAS</b>
+📊 Operaciones: {total_ops}
+💰 Ganancia Promedio: +{avg_ganancia:.2f}%
+📉 Pérdida Promedio: -{avg_perdida:.2f}%
+🔥 Racha actual: {racha_actual} wins
+<b>DESTACADOS</b>
+🏆 Mejor: {mejor_symbol} ({mejor_tipo})
+   → {mejor_pnl:+.2f}%
+⚠️ Peor: {peor_symbol} ({peor_tipo})
+   → {peor_pnl:+.2f}%
+━━━━━━━━━━━━━━━━━━━━
+🤖 Bot automático 24/7
+⚡ Estrategia: Breakout + Reentry
+💎 Acceso Premium: @TuUsuario
+            """
+
+# Métricas de entrada que se copian al registro de cierre, con su valor por defecto
+_SNAPSHOT_DEFAULTS = (
+    ('angulo_tendencia', 0),
+    ('pearson', 0),
+    ('r2_score', 0),
+    ('ancho_canal_relativo', 0),
+    ('ancho_canal_porcentual', 0),
+    ('nivel_fuerza', 1),
+    ('timeframe_utilizado', 'N/A'),
+    ('velas_utilizadas', 0),
+    ('stoch_k', 0),
+    ('stoch_d', 0),
+    ('breakout_usado', False),
+)
+
 class OperationManager:
     """
     Gestor de Operaciones - LÓGICA ORIGINAL INTACTA
@@ -27,14 +84,32 @@ class OperationManager:
         self.log_path = log_path
         self.estado_file = estado_file
         self.operaciones_activas = {}
+        # Protege operaciones_activas y _tiempos_entrada (reentrante: eliminar se llama durante la verificación)
+        self._ops_lock = threading.RLock()
+        # Hora de entrada ya parseada por símbolo (evita fromisoformat en cada ciclo)
+        self._tiempos_entrada: Dict[str, datetime] = {}
         self.telegram_bot = get_telegram_bot()
+        # Precalentar la conexión con Telegram antes de la primera notificación
+        self.telegram_bot.start()
+        self._pending_rows: List[List] = []
+        self._pending_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        # Archivo del CSV abierto una sola vez (se abre en el primer volcado)
+        self._csv_fp = None
+        self._csv_writer = None
+        # Operaciones de los últimos 7 días ya parseadas, en orden de registro
+        self._recent_ops: deque = deque()
         self.inicializar_log()
+        self._bootstrap_recent_ops()
+        # No perder filas pendientes al terminar el proceso
+        atexit.register(self.close)
         logger.info("📋 OperationManager inicializado")
     
     def inicializar_log(self):
         """Inicializa archivo de log - LÓGICA ORIGINAL INTACTA"""
         try:
             if not os.path.exists(self.log_path):
+                ensure_data_dirs()
                 with open(self.log_path, 'w', newline='', encoding='utf-8') as f:
                     writer = csv.writer(f)
                     writer.writerow([
@@ -50,65 +125,149 @@ class OperationManager:
         except Exception as e:
             logger.error(f"❌ Error inicializando log: {e}")
     
+    def _parse_operacion(self, row: Dict) -> Dict:
+        """Convierte una fila del CSV (o datos de operación) al formato del reporte"""
+        return {
+            'timestamp': datetime.fromisoformat(row['timestamp']),
+            'symbol': sys.intern(row['symbol']),
+            'resultado': sys.intern(row['resultado']),
+            'pnl_percent': float(row['pnl_percent']),
+            'tipo': sys.intern(row['tipo']),
+            'breakout_usado': str(row.get('breakout_usado', 'False')) == 'True'
+        }
+    
+    def _bootstrap_recent_ops(self) -> None:
+        """Carga una sola vez desde el CSV las operaciones de la última semana"""
+        try:
+            if not os.path.exists(self.log_path):
+                return
+            fecha_limite = datetime.now() - VENTANA_REPORTE
+            # Los timestamps ISO se ordenan como texto: descartar filas viejas sin parsearlas
+            limite_iso = fecha_limite.isoformat()
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    if (row.get('timestamp') or '') < limite_iso:
+                        continue
+                    try:
+                        op = self._parse_operacion(row)
+                    except Exception:
+                        continue
+                    if op['timestamp'] >= fecha_limite:
+                        self._recent_ops.append(op)
+        except Exception as e:
+            logger.error(f"❌ Error cargando operaciones recientes: {e}")
+    
     def registrar_operacion(self, datos_operacion: Dict) -> bool:
         """Registra operación en CSV - LÓGICA ORIGINAL INTACTA"""
         try:
-            with open(self.log_path, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    datos_operacion['timestamp'],
-                    datos_operacion['symbol'],
-                    datos_operacion['tipo'],
-                    datos_operacion['precio_entrada'],
-                    datos_operacion['take_profit'],
-                    datos_operacion['stop_loss'],
-                    datos_operacion['precio_salida'],
-                    datos_operacion['resultado'],
-                    datos_operacion['pnl_percent'],
-                    datos_operacion['duracion_minutos'],
-                    datos_operacion['angulo_tendencia'],
-                    datos_operacion['pearson'],
-                    datos_operacion['r2_score'],
-                    datos_operacion.get('ancho_canal_relativo', 0),
-                    datos_operacion.get('ancho_canal_porcentual', 0),
-                    datos_operacion.get('nivel_fuerza', 1),
-                    datos_operacion.get('timeframe_utilizado', 'N/A'),
-                    datos_operacion.get('velas_utilizadas', 0),
-                    datos_operacion.get('stoch_k', 0),
-                    datos_operacion.get('stoch_d', 0),
-                    datos_operacion.get('breakout_usado', False)
-                ])
+            row = [
+                datos_operacion['timestamp'],
+                datos_operacion['symbol'],
+                datos_operacion['tipo'],
+                datos_operacion['precio_entrada'],
+                datos_operacion['take_profit'],
+                datos_operacion['stop_loss'],
+                datos_operacion['precio_salida'],
+                datos_operacion['resultado'],
+                datos_operacion['pnl_percent'],
+                datos_operacion['duracion_minutos'],
+                datos_operacion['angulo_tendencia'],
+                datos_operacion['pearson'],
+                datos_operacion['r2_score'],
+                datos_operacion.get('ancho_canal_relativo', 0),
+                datos_operacion.get('ancho_canal_porcentual', 0),
+                datos_operacion.get('nivel_fuerza', 1),
+                datos_operacion.get('timeframe_utilizado', 'N/A'),
+                datos_operacion.get('velas_utilizadas', 0),
+                datos_operacion.get('stoch_k', 0),
+                datos_operacion.get('stoch_d', 0),
+                datos_operacion.get('breakout_usado', False)
+            ]
+            with self._pending_lock:
+                self._pending_rows.append(row)
+                flush = (len(self._pending_rows) >= CSV_BATCH_SIZE or
+                         time.monotonic() - self._last_flush >= CSV_FLUSH_INTERVAL)
+            if flush:
+                self._flush_pending()
+            try:
+                self._recent_ops.append(self._parse_operacion(datos_operacion))
+            except (ValueError, TypeError, KeyError):
+                pass
             logger.info(f"✅ Operación registrada: {datos_operacion['symbol']} - {datos_operacion['resultado']}")
             return True
         except Exception as e:
             logger.error(f"❌ Error registrando operación: {e}")
             return False
     
+    def _flush_pending(self) -> bool:
+        """Escribe las filas pendientes en el CSV de una vez, sobre el archivo ya abierto"""
+        with self._pending_lock:
+            if not self._pending_rows:
+                return True
+            try:
+                if self._csv_fp is None:
+                    self._csv_fp = open(self.log_path, 'a', newline='', encoding='utf-8', buffering=8192)
+                    self._csv_writer = csv.writer(self._csv_fp)
+                self._csv_writer.writerows(self._pending_rows)
+                self._csv_fp.flush()
+                self._pending_rows.clear()
+                self._last_flush = time.monotonic()
+                return True
+            except Exception as e:
+                # Las filas se conservan y el archivo se reabre en el próximo intento
+                logger.error(f"❌ Error escribiendo operaciones pendientes: {e}")
+                if self._csv_fp is not None:
+                    try:
+                        self._csv_fp.close()
+                    except Exception:
+                        pass
+                self._csv_fp = None
+                self._csv_writer = None
+                return False
+    
+    def close(self) -> None:
+        """Vuelca las filas pendientes y cierra el CSV"""
+        self._flush_pending()
+        with self._pending_lock:
+            if self._csv_fp is not None:
+                try:
+                    self._csv_fp.close()
+                except Exception as e:
+                    logger.error(f"❌ Error cerrando log de operaciones: {e}")
+                self._csv_fp = None
+                self._csv_writer = None
+    
     def agregar_operacion_activa(self, simbolo: str, operacion: Dict) -> None:
         """Agrega operación activa"""
-        try:
+        # Símbolo y tipo internados: las comparaciones posteriores resuelven por identidad
+        simbolo = sys.intern(simbolo)
+        if isinstance(operacion.get('tipo'), str):
+            operacion['tipo'] = sys.intern(operacion['tipo'])
+        # Completar una sola vez las métricas faltantes con sus valores por defecto
+        for clave, defecto in _SNAPSHOT_DEFAULTS:
+            operacion.setdefault(clave, defecto)
+        with self._ops_lock:
             self.operaciones_activas[simbolo] = operacion
-            logger.info(f"➕ Operación activa agregada: {simbolo}")
-        except Exception as e:
-            logger.error(f"❌ Error agregando operación activa: {e}")
+            if operacion.get('timestamp_entrada'):
+                self._tiempos_entrada[simbolo] = datetime.fromisoformat(operacion['timestamp_entrada'])
+        logger.info("➕ Operación activa agregada: %s", simbolo)
     
     def eliminar_operacion_activa(self, simbolo: str) -> bool:
         """Elimina operación activa"""
-        try:
-            if simbolo in self.operaciones_activas:
-                del self.operaciones_activas[simbolo]
-                logger.info(f"➖ Operación activa eliminada: {simbolo}")
-                return True
-            else:
-                logger.warning(f"⚠️ Operación activa no encontrada: {simbolo}")
-                return False
-        except Exception as e:
-            logger.error(f"❌ Error eliminando operación activa: {e}")
+        with self._ops_lock:
+            existia = self.operaciones_activas.pop(simbolo, None) is not None
+            self._tiempos_entrada.pop(simbolo, None)
+        if existia:
+            logger.info("➖ Operación activa eliminada: %s", simbolo)
+            return True
+        else:
+            logger.warning("⚠️ Operación activa no encontrada: %s", simbolo)
             return False
     
     def get_operaciones_activas(self) -> Dict[str, Dict]:
         """Obtiene operaciones activas"""
-        return self.operaciones_activas.copy()
+        with self._ops_lock:
+            return self.operaciones_activas.copy()
     
     def get_operaciones_activas_count(self) -> int:
         """Obtiene número de operaciones activas"""
@@ -117,43 +276,50 @@ class OperationManager:
     def verificar_cierre_operaciones(self, obtener_precio_actual_func) -> List[str]:
         """Verifica cierre de operaciones - LÓGICA ORIGINAL INTACTA"""
         operaciones_cerradas = []
+        # Se eliminan al final, en un solo bloque bajo lock
+        cerradas_pendientes = []
         try:
-            for simbolo, operacion in list(self.operaciones_activas.items()):
+            # Snapshot bajo lock; precios y cálculos se hacen fuera de él
+            with self._ops_lock:
+                operaciones = list(self.operaciones_activas.items())
+            
+            # Un único "ahora" para todas las operaciones del ciclo
+            now_dt = datetime.now()
+            now_iso = now_dt.isoformat()
+            
+            for simbolo, operacion in operaciones:
                 try:
                     precio_actual = obtener_precio_actual_func(simbolo)
                     if precio_actual is None:
-                        logger.warning(f"⚠️ No se pudo obtener precio para {simbolo}")
+                        logger.warning("⚠️ No se pudo obtener precio para %s", simbolo)
                         continue
                         
                     tp = operacion['take_profit']
                     sl = operacion['stop_loss']
                     tipo = operacion['tipo']
-                    resultado = None
+                    # +1 LONG / -1 SHORT: una sola comparación por nivel para ambos lados
+                    direccion = 1 if tipo == "LONG" else -1
                     
-                    if tipo == "LONG":
-                        if precio_actual >= tp:
-                            resultado = "TP"
-                        elif precio_actual <= sl:
-                            resultado = "SL"
-                    else:  # SHORT
-                        if precio_actual <= tp:
-                            resultado = "TP"
-                        elif precio_actual >= sl:
-                            resultado = "SL"
+                    if (precio_actual - tp) * direccion >= 0:
+                        resultado = "TP"
+                    elif (sl - precio_actual) * direccion >= 0:
+                        resultado = "SL"
+                    else:
+                        resultado = None
                     
                     if resultado:
                         # Calcular PnL
-                        if tipo == "LONG":
-                            pnl_percent = ((precio_actual - operacion['precio_entrada']) / operacion['precio_entrada']) * 100
-                        else:
-                            pnl_percent = ((operacion['precio_entrada'] - precio_actual) / operacion['precio_entrada']) * 100
+                        precio_entrada = operacion['precio_entrada']
+                        pnl_percent = ((precio_actual - precio_entrada) / precio_entrada) * 100 * direccion
                         
                         # Calcular duración
-                        tiempo_entrada = datetime.fromisoformat(operacion['timestamp_entrada'])
-                        duracion_minutos = (datetime.now() - tiempo_entrada).total_seconds() / 60
+                        tiempo_entrada = self._tiempos_entrada.get(simbolo)
+                        if tiempo_entrada is None:
+                            tiempo_entrada = datetime.fromisoformat(operacion['timestamp_entrada'])
+                        duracion_minutos = (now_dt - tiempo_entrada).total_seconds() / 60
                         
                         datos_operacion = {
-                            'timestamp': datetime.now().isoformat(),
+                            'timestamp': now_iso,
                             'symbol': simbolo,
                             'tipo': tipo,
                             'precio_entrada': operacion['precio_entrada'],
@@ -163,30 +329,31 @@ class OperationManager:
                             'resultado': resultado,
                             'pnl_percent': pnl_percent,
                             'duracion_minutos': duracion_minutos,
-                            'angulo_tendencia': operacion.get('angulo_tendencia', 0),
-                            'pearson': operacion.get('pearson', 0),
-                            'r2_score': operacion.get('r2_score', 0),
-                            'ancho_canal_relativo': operacion.get('ancho_canal_relativo', 0),
-                            'ancho_canal_porcentual': operacion.get('ancho_canal_porcentual', 0),
-                            'nivel_fuerza': operacion.get('nivel_fuerza', 1),
-                            'timeframe_utilizado': operacion.get('timeframe_utilizado', 'N/A'),
-                            'velas_utilizadas': operacion.get('velas_utilizadas', 0),
-                            'stoch_k': operacion.get('stoch_k', 0),
-                            'stoch_d': operacion.get('stoch_d', 0),
-                            'breakout_usado': operacion.get('breakout_usado', False)
+                            # Completadas en agregar_operacion_activa (_SNAPSHOT_DEFAULTS)
+                            'angulo_tendencia': operacion['angulo_tendencia'],
+                            'pearson': operacion['pearson'],
+                            'r2_score': operacion['r2_score'],
+                            'ancho_canal_relativo': operacion['ancho_canal_relativo'],
+                            'ancho_canal_porcentual': operacion['ancho_canal_porcentual'],
+                            'nivel_fuerza': operacion['nivel_fuerza'],
+                            'timeframe_utilizado': operacion['timeframe_utilizado'],
+                            'velas_utilizadas': operacion['velas_utilizadas'],
+                            'stoch_k': operacion['stoch_k'],
+                            'stoch_d': operacion['stoch_d'],
+                            'breakout_usado': operacion['breakout_usado']
                         }
                         
                         # Registrar operación
                         self.registrar_operacion(datos_operacion)
                         
-                        # Enviar notificación de cierre
+                        # Enviar notificación de cierre (TelegramBot la encola, no bloquea)
                         self.telegram_bot.enviar_cierre_operacion(datos_operacion)
                         
-                        # Eliminar de operaciones activas
-                        self.eliminar_operacion_activa(simbolo)
+                        # Eliminar de operaciones activas (al terminar el ciclo)
+                        cerradas_pendientes.append((simbolo, operacion))
                         
                         operaciones_cerradas.append(simbolo)
-                        logger.info(f"     📊 {simbolo} Operación {resultado} - PnL: {pnl_percent:.2f}%")
+                        logger.info("     📊 %s Operación %s - PnL: %.2f%%", simbolo, resultado, pnl_percent)
                         
                 except Exception as e:
                     logger.error(f"❌ Error verificando cierre para {simbolo}: {e}")
@@ -194,41 +361,53 @@ class OperationManager:
                     
         except Exception as e:
             logger.error(f"❌ Error en verificación de cierres: {e}")
+        
+        if cerradas_pendientes:
+            with self._ops_lock:
+                for simbolo, operacion in cerradas_pendientes:
+                    # Solo si no fue reemplazada por una operación nueva durante el ciclo
+                    if self.operaciones_activas.get(simbolo) is operacion:
+                        del self.operaciones_activas[simbolo]
+                        self._tiempos_entrada.pop(simbolo, None)
+            for simbolo, _ in cerradas_pendientes:
+                logger.info("➖ Operación activa eliminada: %s", simbolo)
+        
+        if operaciones_cerradas:
+            self._flush_pending()
             
         return operaciones_cerradas
     
     def filtrar_operaciones_ultima_semana(self) -> List[Dict]:
         """Filtra operaciones de los últimos 7 días - LÓGICA ORIGINAL INTACTA"""
         try:
-            if not os.path.exists(self.log_path):
-                return []
-                
-            ops_recientes = []
-            fecha_limite = datetime.now() - timedelta(days=7)
-            
-            with open(self.log_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    try:
-                        timestamp = datetime.fromisoformat(row['timestamp'])
-                        if timestamp >= fecha_limite:
-                            ops_recientes.append({
-                                'timestamp': timestamp,
-                                'symbol': row['symbol'],
-                                'resultado': row['resultado'],
-                                'pnl_percent': float(row['pnl_percent']),
-                                'tipo': row['tipo'],
-                                'breakout_usado': row.get('breakout_usado', 'False') == 'True'
-                            })
-                    except Exception:
-                        continue
-                        
-            return ops_recientes
+            fecha_limite = datetime.now() - VENTANA_REPORTE
+            # Descartar del frente las operaciones que salieron de la ventana
+            recientes = self._recent_ops
+            while recientes and recientes[0]['timestamp'] < fecha_limite:
+                recientes.popleft()
+            return [op for op in list(recientes) if op['timestamp'] >= fecha_limite]
             
         except Exception as e:
             logger.error(f"❌ Error filtrando operaciones: {e}")
             return []
     
+    def _estadisticas_numpy(self, ops: List[Dict]) -> Tuple:
+        """Estadísticas del reporte con reducciones vectorizadas (para semanas con muchas operaciones)"""
+        pnl = np.fromiter((op['pnl_percent'] for op in ops), dtype=np.float64, count=len(ops))
+        resultados = np.array([op['resultado'] for op in ops])
+        ganancias = pnl[pnl > 0]
+        perdidas = pnl[pnl < 0]
+        return (
+            int(np.count_nonzero(resultados == 'TP')),
+            int(np.count_nonzero(resultados == 'SL')),
+            float(pnl.sum()),
+            float(ganancias.mean()) if ganancias.size else 0,
+            float(np.abs(perdidas).mean()) if perdidas.size else 0,
+            # argmax/argmin devuelven la primera ocurrencia, igual que max()/min()
+            ops[int(pnl.argmax())],
+            ops[int(pnl.argmin())],
+        )
+    
     def generar_reporte_semanal(self) -> Optional[str]:
         """Genera reporte semanal - LÓGICA ORIGINAL INTACTA"""
         try:
@@ -237,16 +416,37 @@ class OperationManager:
                 return None
                 
             total_ops = len(ops_ultima_semana)
-            wins = sum(1 for op in ops_ultima_semana if op['resultado'] == 'TP')
-            losses = sum(1 for op in ops_ultima_semana if op['resultado'] == 'SL')
+            if total_ops >= REPORTE_NUMPY_MIN_OPS:
+                (wins, losses, pnl_total, avg_ganancia, avg_perdida,
+                 mejor_op, peor_op) = self._estadisticas_numpy(ops_ultima_semana)
+            else:
+                # Todas las estadísticas en una sola pasada
+                wins = losses = 0
+                pnl_total = 0
+                sum_ganancias = sum_perdidas = 0
+                n_ganancias = n_perdidas = 0
+                mejor_op = peor_op = ops_ultima_semana[0]
+                for op in ops_ultima_semana:
+                    pnl = op['pnl_percent']
+                    resultado = op['resultado']
+                    if resultado == 'TP':
+                        wins += 1
+                    elif resultado == 'SL':
+                        losses += 1
+                    pnl_total += pnl
+                    if pnl > 0:
+                        sum_ganancias += pnl
+                        n_ganancias += 1
+                    elif pnl < 0:
+                        sum_perdidas += abs(pnl)
+                        n_perdidas += 1
+                    if pnl > mejor_op['pnl_percent']:
+                        mejor_op = op
+                    if pnl < peor_op['pnl_percent']:
+                        peor_op = op
+                avg_ganancia = sum_ganancias/n_ganancias if n_ganancias else 0
+                avg_perdida = sum_perdidas/n_perdidas if n_perdidas else 0
             winrate = (wins/total_ops*100) if total_ops > 0 else 0
-            pnl_total = sum(op['pnl_percent'] for op in ops_ultima_semana)
-            mejor_op = max(ops_ultima_semana, key=lambda x: x['pnl_percent'])
-            peor_op = min(ops_ultima_semana, key=lambda x: x['pnl_percent'])
-            ganancias = [op['pnl_percent'] for op in ops_ultima_semana if op['pnl_percent'] > 0]
-            perdidas = [abs(op['pnl_percent']) for op in ops_ultima_semana if op['pnl_percent'] < 0]
-            avg_ganancia = sum(ganancias)/len(ganancias) if ganancias else 0
-            avg_perdida = sum(perdidas)/len(perdidas) if perdidas else 0
             
             # Calcular racha actual
             racha_actual = 0
@@ -258,32 +458,24 @@ class OperationManager:
                     
             emoji_resultado = "🟢" if pnl_total > 0 else "🔴" if pnl_total < 0 else "⚪"
             
-            mensaje = f"""
-━━━━━━━━━━━━━━━━━━━━
-📊 <b>REPORTE SEMANAL</b>
-━━━━━━━━━━━━━━━━━━━━
-📅 {datetime.now().strftime('%d/%m/%Y')} | Últimos 7 días
-<b>RENDIMIENTO GENERAL</b>
-{emoji_resultado} PnL Total: <b>{pnl_total:+.2f}%</b>
-📈 Win Rate: <b>{winrate:.1f}%</b>
-✅ Ganadas: {wins} | ❌ Perdidas: {losses}
-<b>ESTADÍSTICAS</b>
-📊 Operaciones: {total_ops}
-💰 Ganancia Promedio: +{avg_ganancia:.2f}%
-📉 Pérdida Promedio: -{avg_perdida:.2f}%
-🔥 Racha actual: {racha_actual} wins
-<b>DESTACADOS</b>
-🏆 Mejor: {mejor_op['symbol']} ({mejor_op['tipo']})
-   → {mejor_op['pnl_percent']:+.2f}%
-⚠️ Peor: {peor_op['symbol']} ({peor_op['tipo']})
-   → {peor_op['pnl_percent']:+.2f}%
-━━━━━━━━━━━━━━━━━━━━
-🤖 Bot automático 24/7
-⚡ Estrategia: Breakout + Reentry
-💎 Acceso Premium: @TuUsuario
-            """
-            
-            return mensaje
+            return _REPORTE_TEMPLATE.format(
+                fecha=datetime.now().strftime('%d/%m/%Y'),
+                emoji_resultado=emoji_resultado,
+                pnl_total=pnl_total,
+                winrate=winrate,
+                wins=wins,
+                losses=losses,
+                total_ops=total_ops,
+                avg_ganancia=avg_ganancia,
+                avg_perdida=avg_perdida,
+                racha_actual=racha_actual,
+                mejor_symbol=mejor_op['symbol'],
+                mejor_tipo=mejor_op['tipo'],
+                mejor_pnl=mejor_op['pnl_percent'],
+                peor_symbol=peor_op['symbol'],
+                peor_tipo=peor_op['tipo'],
+                peor_pnl=peor_op['pnl_percent']
+            )
             
         except Exception as e:
             logger.error(f"❌ Error generando reporte semanal: {e}")
@@ -291,9 +483,11 @@ class OperationManager:
     
     def get_stats(self) -> Dict[str, Any]:
         """Obtiene estadísticas del gestor"""
+        with self._ops_lock:
+            simbolos = list(self.operaciones_activas.keys())
         return {
-            'operaciones_activas_count': len(self.operaciones_activas),
-            'operaciones_activas': list(self.operaciones_activas.keys()),
+            'operaciones_activas_count': len(simbolos),
+            'operaciones_activas': simbolos,
             'log_path': self.log_path,
             'log_exists': os.path.exists(self.log_path)
         }
@@ -5,6 +5,8 @@ Código copiado íntegramente del archivo original
 """
 
 import logging
+import sys
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
@@ -13,6 +15,11 @@ from ..bot.telegram_bot import get_telegram_bot
 
 logger = logging.getLogger(__name__)
 
+# Tiempo durante el cual no se repite una señal para el mismo símbolo
+SENAL_TTL_SEGUNDOS = 2 * 3600
+# Cada cuánto se purgan las señales vencidas
+SENAL_SWEEP_SEGUNDOS = 60
+
 class SignalGenerator:
     """
     Generador de Señales - LÓGICA ORIGINAL INTACTA
@@ -22,7 +29,8 @@ class SignalGenerator:
     def __init__(self):
         """Inicializa el generador de señales"""
         self.telegram_bot = get_telegram_bot()
-        self.senales_enviadas = set()
+        self.senales_enviadas: Dict[str, float] = {}  # símbolo -> momento de envío (monotonic)
+        self._last_sweep = time.monotonic()
         logger.info("📊 SignalGenerator inicializado")
     
     def generar_senal_operacion(self, simbolo: str, tipo_operacion: str, precio_entrada: float, 
@@ -32,15 +40,22 @@ class SignalGenerator:
         Genera y envía señal de operación - LÓGICA ORIGINAL INTACTA
         """
         try:
-            if simbolo in self.senales_enviadas:
-                logger.warning(f"⚠️ Señal ya enviada para {simbolo}")
+            simbolo = sys.intern(simbolo)
+            now = time.monotonic()
+            if now - self._last_sweep > SENAL_SWEEP_SEGUNDOS:
+                self._purgar_senales(now - SENAL_TTL_SEGUNDOS)
+            
+            enviada = self.senales_enviadas.get(simbolo)
+            if enviada is not None and now - enviada < SENAL_TTL_SEGUNDOS:
+                logger.warning("⚠️ Señal ya enviada para %s", simbolo)
                 return False
                 
             if precio_entrada is None or tp is None or sl is None:
-                logger.warning(f"    ❌ Niveles inválidos para {simbolo}, omitiendo señal")
+                logger.warning("    ❌ Niveles inválidos para %s, omitiendo señal", simbolo)
                 return False
                 
-            logger.info(f"🎯 Generando señal {tipo_operacion} para {simbolo}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"🎯 Generando señal {tipo_operacion} para {simbolo}")
             
             # Enviar señal por Telegram
             exito = self.telegram_bot.enviar_senal_operacion(
@@ -49,11 +64,12 @@ class SignalGenerator:
             )
             
             if exito:
-                self.senales_enviadas.add(simbolo)
-                logger.info(f"✅ Señal {tipo_operacion} para {simbolo} generada y enviada")
+                self.senales_enviadas[simbolo] = time.monotonic()
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"✅ Señal {tipo_operacion} para {simbolo} generada y enviada")
                 return True
             else:
-                logger.warning(f"⚠️ Error enviando señal para {simbolo}")
+                logger.warning("⚠️ Error enviando señal para %s", simbolo)
                 return False
                 
         except Exception as e:
@@ -66,16 +82,18 @@ class SignalGenerator:
         Envía alerta de breakout - LÓGICA ORIGINAL INTACTA
         """
         try:
-            logger.info(f"🚀 Enviando alerta de breakout para {simbolo}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"🚀 Enviando alerta de breakout para {simbolo}")
             
             exito = self.telegram_bot.enviar_alerta_breakout(
                 simbolo, tipo_breakout, info_canal, datos_mercado, config_optima
             )
             
             if exito:
-                logger.info(f"✅ Alerta de breakout enviada para {simbolo}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"✅ Alerta de breakout enviada para {simbolo}")
             else:
-                logger.warning(f"⚠️ Error enviando alerta de breakout para {simbolo}")
+                logger.warning("⚠️ Error enviando alerta de breakout para %s", simbolo)
                 
             return exito
             
@@ -83,13 +101,19 @@ class SignalGenerator:
             logger.error(f"❌ Error enviando alerta de breakout: {e}")
             return False
     
+    def _purgar_senales(self, limite: float) -> int:
+        """Elimina las señales enviadas antes de `limite` (monotonic); retorna cuántas quitó"""
+        antes = len(self.senales_enviadas)
+        self.senales_enviadas = {s: t for s, t in self.senales_enviadas.items() if t >= limite}
+        self._last_sweep = time.monotonic()
+        return antes - len(self.senales_enviadas)
+    
     def limpiar_senales_antiguas(self, horas_limite: int = 2) -> None:
         """Limpia señales antiguas para permitir nuevas entradas"""
         try:
-            # Por ahora solo resetear el set
-            # En una implementación más sofisticada, se podría usar timestamps
-            self.senales_enviadas.clear()
-            logger.info(f"🗑️ Señales limpiadas (límite: {horas_limite} horas)")
+            eliminadas = self._purgar_senales(time.monotonic() - horas_limite * 3600)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"🗑️ Señales limpiadas: {eliminadas} (límite: {horas_limite} horas)")
         except Exception as e:
             logger.error(f"❌ Error limpiando señales: {e}")
     
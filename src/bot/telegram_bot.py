@@ -4,25 +4,201 @@ Bot de Telegram para el Sistema de Trading
 Código copiado íntegramente del archivo original
 """
 
+import atexit
+import functools
+import importlib.util
+import random
 import requests
 import time
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
-from io import BytesIO
+from requests.adapters import HTTPAdapter
 
-from ..config.settings import *
+from ..config.settings import (
+    TELEGRAM_MAX_WORKERS, TELEGRAM_MAX_INFLIGHT, TELEGRAM_MAX_RETRIES, TELEGRAM_MAX_BACKOFF,
+    TELEGRAM_GLOBAL_BURST, TELEGRAM_GLOBAL_RATE, TELEGRAM_CHAT_BURST, TELEGRAM_CHAT_RATE,
+    TELEGRAM_QUEUE_MAXSIZE, TELEGRAM_COALESCE_WINDOW, TELEGRAM_MAX_MESSAGE_LENGTH, TELEGRAM_DEDUP_TTL,
+    TELEGRAM_KEEPALIVE_INTERVAL
+)
 from ..config.environment import get_telegram_config
 
+try:
+    import orjson
+except ImportError:
+    # orjson es opcional: se usa json estándar como fallback
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    # httpx es opcional: sin él se usa requests (HTTP/1.1)
+    httpx = None
+# httpx solo se usa con HTTP/2, que requiere el paquete h2
+if httpx is not None and importlib.util.find_spec('h2') is None:
+    httpx = None
+
 logger = logging.getLogger(__name__)
 
+# Errores de red reintentables según el cliente HTTP en uso
+_NETWORK_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+def _json_dumps(payload: Dict) -> bytes:
+    """Serializa el payload de sendMessage a JSON UTF-8"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+@functools.lru_cache(maxsize=256)
+def _chat_id_json(chat_id: str) -> bytes:
+    """chat_id ya serializado como valor JSON"""
+    return _json_dumps(chat_id)
+
+def _json_loads(content: bytes) -> Any:
+    """Decodifica el cuerpo de una respuesta de Telegram"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+# Tope global de POSTs simultáneos hacia Telegram
+_send_semaphore = threading.BoundedSemaphore(TELEGRAM_MAX_INFLIGHT)
+
+# Separador entre mensajes agrupados en un solo sendMessage
+_SEPARADOR_LOTE = "\n\n---\n\n"
+
+# ============================
+# PLANTILLAS DE MENSAJES
+# ============================
+
+# Por tipo de breakout: (emoji_principal, tipo_texto, direccion_emoji, expectativa)
+_BREAKOUT_TIPOS = {
+    "BREAKOUT_LONG": ("🚀", "RUPTURA de SOPORTE", "⬇️",
+                      "posible entrada en long si el precio reingresa al canal"),
+    "BREAKOUT_SHORT": ("📉", "RUPTURA BAJISTA de RESISTENCIA", "⬆️",
+                       "posible entrada en sort si el precio reingresa al canal"),
+}
+
+_BREAKOUT_TEMPLATE = """
+{emoji_principal} <b>¡BREAKOUT DETECTADO! - {simbolo}</b>
+⚠️ <b>{tipo_texto}</b> {direccion_emoji}
+⏰ <b>Hora:</b> {hora}
+⏳ <b>ESPERANDO REINGRESO...</b>
+👁️ Máximo 30 minutos para confirmación
+📍 {expectativa}
+            """
+
+STOCH_ESTADO_LONG = "📉 SOBREVENTA"
+STOCH_ESTADO_SHORT = "📈 SOBRECOMPRA"
+
+_SENAL_BREAKOUT_TEMPLATE = """
+🚀 <b>BREAKOUT + REENTRY DETECTADO:</b>
+⏰ Tiempo desde breakout: {tiempo_breakout:.1f} minutos
+💰 Precio breakout: {precio_breakout:.8f}
+                """
+
+_SENAL_TEMPLATE = """
+🎯 <b>SEÑAL DE {tipo_operacion} - {simbolo}</b>
+{breakout_texto}
+⏱️ <b>Configuración óptima:</b>
+📊 Timeframe: {timeframe}
+🕯️ Velas: {num_velas}
+📏 Ancho Canal: {ancho_canal_porcentual:.1f}% ⭐
+💰 <b>Precio Actual:</b> {precio_actual:.8f}
+🎯 <b>Entrada:</b> {precio_entrada:.8f}
+🛑 <b>Stop Loss:</b> {sl:.8f}
+🎯 <b>Take Profit:</b> {tp:.8f}
+📊 <b>Ratio R/B:</b> {ratio_rr:.2f}:1
+🎯 <b>SL:</b> {sl_percent:.2f}%
+🎯 <b>TP:</b> {tp_percent:.2f}%
+💰 <b>Riesgo:</b> {riesgo:.8f}
+🎯 <b>Beneficio Objetivo:</b> {beneficio:.8f}
+📈 <b>Tendencia:</b> {direccion}
+💪 <b>Fuerza:</b> {fuerza_texto}
+📏 <b>Ángulo:</b> {angulo_tendencia:.1f}°
+📊 <b>Pearson:</b> {coeficiente_pearson:.3f}
+🎯 <b>R² Score:</b> {r2_score:.3f}
+🎰 <b>Stochástico:</b> {stoch_estado}
+📊 <b>Stoch K:</b> {stoch_k:.1f}
+📈 <b>Stoch D:</b> {stoch_d:.1f}
+⏰ <b>Hora:</b> {hora}
+💡 <b>Estrategia:</b> BREAKOUT + REENTRY con confirmación Stochastic
+            """
+
+_CIERRE_TEMPLATE = """
+{emoji} <b>OPERACIÓN CERRADA - {symbol}</b>
+{color_emoji} <b>RESULTADO: {resultado}</b>
+📊 Tipo: {tipo}
+💰 Entrada: {precio_entrada:.8f}
+🎯 Salida: {precio_salida:.8f}
+💵 PnL Absoluto: {pnl_absoluto:.8f}
+📈 PnL %: {pnl_percent:.2f}%
+⏰ Duración: {duracion_minutos:.1f} minutos
+🚀 Breakout+Reentry: {breakout_usado}
+📏 Ángulo: {angulo_tendencia:.1f}°
+📊 Pearson: {pearson:.3f}
+🎯 R²: {r2_score:.3f}
+📏 Ancho: {ancho_canal_porcentual:.1f}%
+⏱️ TF: {timeframe_utilizado}
+🕯️ Velas: {velas_utilizadas}
+🕒 {timestamp}
+            """
+
+class AdaptiveTokenBucket:
+    """Token bucket cuyo ritmo sube poco a poco con éxitos y cae a la mitad con cada 429"""
+    
+    def __init__(self, capacity: float, rate: float, min_rate: float = None,
+                 increase_step: float = None, decrease_factor: float = 0.5):
+        self.capacity = float(capacity)
+        self.max_rate = float(rate)
+        self.min_rate = float(min_rate) if min_rate is not None else self.max_rate / 10
+        self.increase_step = float(increase_step) if increase_step is not None else self.max_rate / 20
+        self.decrease_factor = decrease_factor
+        self.rate = self.max_rate
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Bloquea hasta disponer de un token"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def increase_rate(self) -> None:
+        """Incremento aditivo tras un envío exitoso"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+    
+    def decrease_rate(self) -> None:
+        """Reducción multiplicativa tras un 429"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+
 class TelegramBot:
     """
     Bot de Telegram - LÓGICA ORIGINAL INTACTA
     NO MODIFICAR ESTE CÓDIGO
     """
     
+    __slots__ = ('telegram_config', 'token', 'chat_ids', 'base_url', 'enabled',
+                 '_send_url', '_session', '_executor', '_global_bucket', '_chat_buckets',
+                 '_buckets_lock', '_recent', '_recent_lock', '_send_queue', '_sender_thread',
+                 '_start_lock', '_keepalive_stop', '_keepalive_thread')
+    
     def __init__(self):
         """Inicializa el bot de Telegram"""
         try:
@@ -30,6 +206,21 @@ class TelegramBot:
             self.token = self.telegram_config['token']
             self.chat_ids = self.telegram_config['chat_ids']
             self.base_url = f"https://api.telegram.org/bot{self.token}"
+            self._send_url = f"{self.base_url}/sendMessage"
+            self._session = self._create_session()
+            self._global_bucket = AdaptiveTokenBucket(TELEGRAM_GLOBAL_BURST, TELEGRAM_GLOBAL_RATE)
+            self._chat_buckets: Dict[str, AdaptiveTokenBucket] = {}
+            self._buckets_lock = threading.Lock()
+            # (chat_id, hash del texto) -> instante del último envío (monotonic), en orden de inserción
+            self._recent: 'OrderedDict[tuple, float]' = OrderedDict()
+            self._recent_lock = threading.Lock()
+            self._send_queue: queue.Queue = queue.Queue(maxsize=TELEGRAM_QUEUE_MAXSIZE)
+            # Pool e hilo de envío se crean en el primer envío (ver _ensure_started)
+            self._executor: Optional[ThreadPoolExecutor] = None
+            self._sender_thread: Optional[threading.Thread] = None
+            self._start_lock = threading.Lock()
+            self._keepalive_stop = threading.Event()
+            self._keepalive_thread: Optional[threading.Thread] = None
             
             if not self.token:
                 logger.warning("⚠️ TELEGRAM_TOKEN no configurado - Bot deshabilitado")
@@ -42,6 +233,58 @@ class TelegramBot:
             logger.error(f"❌ Error inicializando TelegramBot: {e}")
             self.enabled = False
     
+    def _create_session(self):
+        """
+        Cliente HTTP persistente: reutiliza la conexión TLS con api.telegram.org.
+        Con httpx usa HTTP/2 (varios envíos multiplexados en una conexión).
+        """
+        if httpx is not None:
+            return httpx.Client(
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+            )
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        session.mount("https://", adapter)
+        return session
+    
+    def _keepalive(self) -> None:
+        """
+        Hilo de keepalive (arranca con el primer envío): un getMe inmediato para
+        precalentar la conexión y luego uno cada TELEGRAM_KEEPALIVE_INTERVAL
+        segundos, para que no se cierre por inactividad. Best-effort.
+        """
+        url = f"{self.base_url}/getMe"
+        while True:
+            try:
+                self._session.get(url, timeout=5)
+            except Exception as e:
+                logger.debug("Keepalive de Telegram falló: %s", e)
+            if self._keepalive_stop.wait(TELEGRAM_KEEPALIVE_INTERVAL):
+                break
+    
+    def _ensure_started(self) -> None:
+        """
+        Crea el pool, el hilo de envío y el keepalive en el primer uso. La instancia
+        global se construye al importar el módulo: así importar no lanza hilos ni
+        requests en procesos que nunca envían (sin token, padre de gunicorn, etc.).
+        """
+        if self._sender_thread is not None:
+            return
+        with self._start_lock:
+            if self._sender_thread is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=TELEGRAM_MAX_WORKERS, thread_name_prefix='TelegramSend')
+            sender = threading.Thread(target=self._send_worker, name='TelegramSender', daemon=True)
+            sender.start()
+            if self.token:
+                # Mantiene viva la conexión para los envíos siguientes
+                self._keepalive_thread = threading.Thread(target=self._keepalive, name='TelegramKeepalive', daemon=True)
+                self._keepalive_thread.start()
+            atexit.register(self.close)
+            self._sender_thread = sender
+    
     def test_connection(self) -> bool:
         """Prueba la conexión con Telegram"""
         try:
@@ -50,10 +293,10 @@ class TelegramBot:
                 return False
                 
             url = f"{self.base_url}/getMe"
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, timeout=10)
             
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 if result.get('ok'):
                     bot_info = result.get('result', {})
                     logger.info(f"✅ Conexión exitosa - Bot: @{bot_info.get('username', 'Unknown')}")
@@ -69,8 +312,12 @@ class TelegramBot:
             logger.error(f"❌ Error probando conexión de Telegram: {e}")
             return False
     
-    def _enviar_telegram_simple(self, mensaje: str, token: str = None, chat_ids: List[str] = None) -> bool:
-        """Envía mensaje simple por Telegram - LÓGICA ORIGINAL INTACTA"""
+    def _enviar_telegram_simple(self, mensaje: str, token: str = None, chat_ids: List[str] = None,
+                                force: bool = False, huellas: Tuple[int, ...] = ()) -> bool:
+        """
+        Envía mensaje simple por Telegram - LÓGICA ORIGINAL INTACTA
+        `huellas` son los hashes reservados al encolar; se liberan por chat si el envío falla.
+        """
         try:
             if not token or not chat_ids:
                 token = self.token
@@ -78,30 +325,269 @@ class TelegramBot:
                 
             if not token or not chat_ids:
                 logger.warning("⚠️ Configuración de Telegram incompleta")
+                self._liberar_envios(chat_ids or (), huellas)
                 return False
                 
-            resultados = []
-            for chat_id in chat_ids:
+            if token == self.token:
+                url = self._send_url
+            else:
                 url = f"https://api.telegram.org/bot{token}/sendMessage"
-                payload = {'chat_id': chat_id, 'text': mensaje, 'parse_mode': 'HTML'}
-                try:
-                    r = requests.post(url, json=payload, timeout=10)
-                    resultados.append(r.status_code == 200)
-                    if r.status_code == 200:
-                        logger.debug(f"✅ Mensaje enviado a chat {chat_id}")
-                    else:
-                        logger.warning(f"⚠️ Error enviando a chat {chat_id}: {r.status_code}")
-                except Exception as e:
-                    logger.error(f"❌ Error enviando a chat {chat_id}: {e}")
-                    resultados.append(False)
-            return any(resultados)
+            
+            if len(chat_ids) == 1:
+                return self._enviar_a_chat(url, chat_ids[0], mensaje, force, huellas=huellas)
+            
+            self._ensure_started()
+            # El texto se serializa una sola vez; por chat solo se agrega el chat_id
+            prefijo = _json_dumps({'text': mensaje, 'parse_mode': 'HTML'})[:-1]
+            
+            # Un POST por chat en paralelo: la latencia total es ~1 RTT en vez de N
+            futuros = [
+                self._executor.submit(self._enviar_a_chat, url, chat_id, mensaje, force, prefijo, huellas)
+                for chat_id in chat_ids
+            ]
+            # Se esperan todos (cada envío registra su propio log); basta un éxito
+            exito = False
+            for futuro in as_completed(futuros):
+                exito |= futuro.result()
+            return exito
             
         except Exception as e:
             logger.error(f"❌ Error en _enviar_telegram_simple: {e}")
+            self._liberar_envios(chat_ids or (), huellas)
             return False
     
-    def enviar_mensaje(self, mensaje: str, chat_id: str = None) -> bool:
-        """Envía mensaje a uno o todos los chats"""
+    def _purgar_recientes(self, ahora: float) -> None:
+        """Descarta las claves más viejas que TELEGRAM_DEDUP_TTL (llamar con _recent_lock tomado)"""
+        limite = ahora - TELEGRAM_DEDUP_TTL
+        while self._recent:
+            primera, enviado = next(iter(self._recent.items()))
+            if enviado >= limite:
+                break
+            del self._recent[primera]
+    
+    def _es_duplicado(self, clave: tuple) -> bool:
+        """Indica si `clave` se envió dentro de TELEGRAM_DEDUP_TTL (purga las vencidas)"""
+        with self._recent_lock:
+            self._purgar_recientes(time.monotonic())
+            return clave in self._recent
+    
+    def _reservar_envio(self, clave: tuple) -> bool:
+        """
+        Reserva provisoria de `clave` al encolar: retorna True si no estaba vigente
+        y False si es un duplicado. Consulta y registro van bajo el mismo lock: dos
+        copias simultáneas no pasan ambas. Si el envío falla se libera con _liberar_envios.
+        """
+        ahora = time.monotonic()
+        with self._recent_lock:
+            self._purgar_recientes(ahora)
+            if clave in self._recent:
+                return False
+            self._recent[clave] = ahora
+            return True
+    
+    def _liberar_envios(self, chat_ids, huellas: Tuple[int, ...]) -> None:
+        """Quita las reservas de envíos que fallaron, para que un reenvío no se descarte"""
+        if not huellas:
+            return
+        with self._recent_lock:
+            for chat_id in chat_ids:
+                for huella in huellas:
+                    self._recent.pop((chat_id, huella), None)
+    
+    def _marcar_enviado(self, clave: tuple) -> None:
+        """Registra el envío de `clave` al final del orden de expiración"""
+        with self._recent_lock:
+            self._recent[clave] = time.monotonic()
+            self._recent.move_to_end(clave)
+    
+    def _enviar_a_chat(self, url: str, chat_id: str, mensaje: str, force: bool = False,
+                       prefijo: Optional[bytes] = None, huellas: Tuple[int, ...] = ()) -> bool:
+        """
+        Envía el mensaje a un chat; retorna True si Telegram respondió 200.
+        `prefijo` es el JSON de texto+parse_mode sin la llave final (envíos a varios chats).
+        `huellas` son las reservas hechas al encolar; se liberan si el envío falla.
+        """
+        clave = (chat_id, hash(mensaje))
+        if not force and self._es_duplicado(clave):
+            logger.debug("⏭️ skipped_duplicate: mensaje repetido para chat %s", chat_id)
+            return True
+        
+        if prefijo is None:
+            body = _json_dumps({'chat_id': chat_id, 'text': mensaje, 'parse_mode': 'HTML'})
+        else:
+            body = prefijo + b',"chat_id":' + _chat_id_json(chat_id) + b'}'
+        try:
+            r = self._post_with_retry(url, chat_id, body)
+            if r.status_code == 200:
+                if not force:
+                    self._marcar_enviado(clave)
+                logger.debug("✅ Mensaje enviado a chat %s", chat_id)
+                return True
+            logger.warning("⚠️ Error enviando a chat %s: %s", chat_id, r.status_code)
+        except Exception as e:
+            logger.error(f"❌ Error enviando a chat {chat_id}: {e}")
+        self._liberar_envios((chat_id,), huellas)
+        return False
+    
+    def _chat_bucket(self, chat_id: str) -> AdaptiveTokenBucket:
+        """Bucket de pacing del chat (creado en el primer envío)"""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            with self._buckets_lock:
+                bucket = self._chat_buckets.setdefault(
+                    chat_id, AdaptiveTokenBucket(TELEGRAM_CHAT_BURST, TELEGRAM_CHAT_RATE)
+                )
+        return bucket
+    
+    @staticmethod
+    def _retry_after(response: Any, default: float) -> float:
+        """
+        Segundos de espera indicados por Telegram en un 429 (respuesta de requests
+        o de httpx). Si ni el cuerpo ni la cabecera Retry-After traen un número
+        (p. ej. una fecha HTTP), se usa `default`.
+        """
+        try:
+            return float(_json_loads(response.content)['parameters']['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            pass
+        try:
+            return float(response.headers['Retry-After'])
+        except (KeyError, TypeError, ValueError):
+            return default
+    
+    def _post_with_retry(self, url: str, chat_id: str, body: bytes) -> Any:
+        """
+        POST con reintentos: respeta retry_after en 429 y aplica backoff exponencial
+        en 5xx y errores de red. Retorna la última respuesta; en el último intento
+        los errores de red se propagan.
+        """
+        chat_bucket = self._chat_bucket(chat_id)
+        for intento in range(TELEGRAM_MAX_RETRIES):
+            ultimo = intento == TELEGRAM_MAX_RETRIES - 1
+            # Espaciar de forma preventiva para no llegar al 429
+            self._global_bucket.acquire()
+            chat_bucket.acquire()
+            try:
+                with _send_semaphore:
+                    if httpx is not None:
+                        r = self._session.post(url, content=body, headers=_JSON_HEADERS, timeout=10)
+                    else:
+                        r = self._session.post(url, data=body, headers=_JSON_HEADERS, timeout=10)
+            except _NETWORK_ERRORS as e:
+                if ultimo:
+                    raise
+                motivo = str(e)
+                espera = min(2 ** intento, TELEGRAM_MAX_BACKOFF)
+            else:
+                if r.status_code == 429:
+                    self._global_bucket.decrease_rate()
+                    chat_bucket.decrease_rate()
+                    espera = self._retry_after(r, min(2 ** intento, TELEGRAM_MAX_BACKOFF))
+                elif r.status_code >= 500:
+                    espera = min(2 ** intento, TELEGRAM_MAX_BACKOFF)
+                else:
+                    if r.status_code == 200:
+                        self._global_bucket.increase_rate()
+                        chat_bucket.increase_rate()
+                    return r
+                if ultimo:
+                    return r
+                motivo = f"HTTP {r.status_code}"
+            
+            espera += random.uniform(0, 0.5)
+            logger.warning(
+                "⏳ Telegram %s - reintento %d/%d en %.1fs",
+                motivo, intento + 1, TELEGRAM_MAX_RETRIES - 1, espera,
+                extra={'backoff_seconds': espera}
+            )
+            time.sleep(espera)
+    
+    def _encolar(self, mensaje: str, chat_ids: List[str] = None, force: bool = False) -> bool:
+        """
+        Encola el mensaje para el hilo de envío; si la cola está llena lo envía directo.
+        La deduplicación se hace acá, por mensaje y por chat, antes de que el hilo
+        de envío lo agrupe con otros (el texto agrupado ya no es comparable).
+        """
+        self._ensure_started()
+        destinos = tuple(chat_ids) if chat_ids else tuple(self.chat_ids)
+        huella = None
+        if not force:
+            huella = hash(mensaje)
+            destinos = tuple(chat_id for chat_id in destinos if self._reservar_envio((chat_id, huella)))
+            if not destinos:
+                logger.debug("⏭️ skipped_duplicate: mensaje repetido para todos los chats")
+                return True
+        try:
+            self._send_queue.put_nowait((destinos, mensaje, huella))
+            return True
+        except queue.Full:
+            logger.warning("⚠️ Cola de Telegram llena - envío directo")
+            # Ya deduplicado arriba
+            huellas = (huella,) if huella is not None else ()
+            return self._enviar_telegram_simple(mensaje, self.token, list(destinos), force=True, huellas=huellas)
+    
+    def _send_worker(self) -> None:
+        """
+        Hilo de envío: agrupa los mensajes que llegan dentro de la ventana de
+        coalescencia y manda un solo sendMessage por destino, respetando el orden
+        """
+        detener = False
+        while not detener:
+            item = self._send_queue.get()
+            if item is None:
+                break
+            lote = [item]
+            tamano = len(item[1])
+            while tamano < TELEGRAM_MAX_MESSAGE_LENGTH:
+                try:
+                    item = self._send_queue.get(timeout=TELEGRAM_COALESCE_WINDOW)
+                except queue.Empty:
+                    break
+                if item is None:
+                    detener = True
+                    break
+                lote.append(item)
+                tamano += len(item[1])
+            
+            # Agrupar por destino conservando el orden de llegada
+            por_destino: Dict[tuple, List[Tuple[str, Optional[int]]]] = {}
+            for chat_ids, mensaje, huella in lote:
+                por_destino.setdefault(chat_ids, []).append((mensaje, huella))
+            
+            # Los mensajes ya se deduplicaron al encolar: el texto agrupado se envía con force.
+            # Si el envío falla se liberan sus reservas para no descartar un reenvío.
+            for chat_ids, mensajes in por_destino.items():
+                for texto, huellas in self._agrupar_mensajes(mensajes):
+                    try:
+                        self._enviar_telegram_simple(texto, self.token, list(chat_ids), force=True, huellas=huellas)
+                    except Exception as e:
+                        logger.error(f"❌ Error en hilo de envío de Telegram: {e}")
+                        self._liberar_envios(chat_ids, huellas)
+    
+    @staticmethod
+    def _agrupar_mensajes(mensajes: List[Tuple[str, Optional[int]]]) -> List[Tuple[str, Tuple[int, ...]]]:
+        """
+        Une mensajes consecutivos sin superar el largo máximo de Telegram.
+        Retorna (texto, huellas reservadas de los mensajes que lo componen).
+        """
+        textos = []
+        actual = ""
+        huellas: List[int] = []
+        for mensaje, huella in mensajes:
+            if actual and len(actual) + len(_SEPARADOR_LOTE) + len(mensaje) > TELEGRAM_MAX_MESSAGE_LENGTH:
+                textos.append((actual, tuple(huellas)))
+                actual = mensaje
+                huellas = []
+            else:
+                actual = f"{actual}{_SEPARADOR_LOTE}{mensaje}" if actual else mensaje
+            if huella is not None:
+                huellas.append(huella)
+        if actual:
+            textos.append((actual, tuple(huellas)))
+        return textos
+    
+    def enviar_mensaje(self, mensaje: str, chat_id: str = None, force: bool = False) -> bool:
+        """Envía mensaje a uno o todos los chats (force=True reenvía aunque sea repetido)"""
         try:
             if not self.enabled:
                 logger.warning("⚠️ Telegram deshabilitado")
@@ -109,74 +595,114 @@ class TelegramBot:
                 
             if chat_id:
                 # Enviar a chat específico
-                return self._enviar_telegram_simple(mensaje, self.token, [chat_id])
+                return self._encolar(mensaje, [chat_id], force)
             else:
                 # Enviar a todos los chats
-                return self._enviar_telegram_simple(mensaje)
+                return self._encolar(mensaje, force=force)
                 
         except Exception as e:
             logger.error(f"❌ Error enviando mensaje: {e}")
             return False
     
+    @staticmethod
+    def _mensaje_alerta_breakout(simbolo: str, tipo_breakout: str) -> str:
+        """Construye el texto de la alerta de breakout"""
+        emoji_principal, tipo_texto, direccion_emoji, expectativa = _BREAKOUT_TIPOS.get(
+            tipo_breakout, _BREAKOUT_TIPOS["BREAKOUT_SHORT"]
+        )
+        
+        # Mensaje de alerta
+        return _BREAKOUT_TEMPLATE.format_map({
+            'emoji_principal': emoji_principal,
+            'simbolo': simbolo,
+            'tipo_texto': tipo_texto,
+            'direccion_emoji': direccion_emoji,
+            'hora': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'expectativa': expectativa,
+        })
+    
     def enviar_alerta_breakout(self, simbolo: str, tipo_breakout: str, info_canal: Dict, 
                              datos_mercado: Dict, config_optima: Dict) -> bool:
         """
         Envía alerta de BREAKOUT detectado - LÓGICA ORIGINAL INTACTA
         """
-        try:
-            if not self.enabled:
-                logger.warning("⚠️ Telegram deshabilitado - no se puede enviar alerta")
-                return False
-                
-            precio_cierre = datos_mercado['cierres'][-1]
-            resistencia = info_canal['resistencia']
-            soporte = info_canal['soporte']
-            direccion_canal = info_canal['direccion']
-            
-            # Determinar tipo de ruptura CORREGIDO SEGÚN LA ESTRATEGIA
-            if tipo_breakout == "BREAKOUT_LONG":
-                emoji_principal = "🚀"
-                tipo_texto = "RUPTURA de SOPORTE"
-                nivel_roto = f"Soporte: {soporte:.8f}"
-                direccion_emoji = "⬇️"
-                contexto = f"Canal {direccion_canal} → Ruptura de SOPORTE"
-                expectativa = "posible entrada en long si el precio reingresa al canal"
-            else:  # BREAKOUT_SHORT
-                emoji_principal = "📉"
-                tipo_texto = "RUPTURA BAJISTA de RESISTENCIA"
-                nivel_roto = f"Resistencia: {resistencia:.8f}"
-                direccion_emoji = "⬆️"
-                contexto = f"Canal {direccion_canal} → Rechazo desde RESISTENCIA"
-                expectativa = "posible entrada en sort si el precio reingresa al canal"
-                
-            # Mensaje de alerta
-            mensaje = f"""
-{emoji_principal} <b>¡BREAKOUT DETECTADO! - {simbolo}</b>
-⚠️ <b>{tipo_texto}</b> {direccion_emoji}
-⏰ <b>Hora:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-⏳ <b>ESPERANDO REINGRESO...</b>
-👁️ Máximo 30 minutos para confirmación
-📍 {expectativa}
-            """
-            
-            logger.info(f"     📊 Generando gráfico de breakout para {simbolo}...")
-            
-            # Aquí se integraría con el generador de gráficos
-            # buf = self.generar_grafico_breakout(simbolo, info_canal, datos_mercado, tipo_breakout, config_optima)
+        if not self.enabled:
+            logger.warning("⚠️ Telegram deshabilitado - no se puede enviar alerta")
+            return False
             
-            # Enviar mensaje sin gráfico por ahora
-            exito = self._enviar_telegram_simple(mensaje)
+        mensaje = self._mensaje_alerta_breakout(simbolo, tipo_breakout)
+        
+        logger.info("     📊 Generando gráfico de breakout para %s...", simbolo)
+        
+        # Aquí se integraría con el generador de gráficos
+        # buf = self.generar_grafico_breakout(simbolo, info_canal, datos_mercado, tipo_breakout, config_optima)
+        
+        # Enviar mensaje sin gráfico por ahora (en segundo plano)
+        try:
+            exito = self._encolar(mensaje)
+        except Exception:
+            logger.exception("❌ Error enviando alerta de breakout")
+            return False
+        
+        if exito:
+            logger.info("     ✅ Alerta de breakout enviada para %s", simbolo)
+        else:
+            logger.warning("     ⚠️ Error enviando alerta de breakout para %s", simbolo)
             
-            if exito:
-                logger.info(f"     ✅ Alerta de breakout enviada para {simbolo}")
-            else:
-                logger.warning(f"     ⚠️ Error enviando alerta de breakout para {simbolo}")
-                
-            return exito
+        return exito
+    
+    @staticmethod
+    def _mensaje_senal_operacion(simbolo: str, tipo_operacion: str, precio_entrada: float,
+                                 tp: float, sl: float, info_canal: Dict, datos_mercado: Dict,
+                                 config_optima: Dict, breakout_info: Dict = None) -> str:
+        """Construye el texto de la señal de operación"""
+        # Una sola lectura del reloj por mensaje
+        now = datetime.now()
+        
+        riesgo = abs(precio_entrada - sl)
+        beneficio = abs(tp - precio_entrada)
+        ratio_rr = beneficio / riesgo if riesgo > 0 else 0
+        
+        # Calcular SL y TP en porcentaje
+        sl_percent = abs((sl - precio_entrada) / precio_entrada) * 100
+        tp_percent = abs((tp - precio_entrada) / precio_entrada) * 100
+        
+        stoch_estado = STOCH_ESTADO_LONG if tipo_operacion == "LONG" else STOCH_ESTADO_SHORT
+        
+        breakout_texto = ""
+        if breakout_info:
+            tiempo_breakout = (now - breakout_info['timestamp']).total_seconds() / 60
+            breakout_texto = _SENAL_BREAKOUT_TEMPLATE.format(
+                tiempo_breakout=tiempo_breakout,
+                precio_breakout=breakout_info['precio_breakout']
+            )
             
-        except Exception as e:
-            logger.error(f"❌ Error enviando alerta de breakout: {e}")
-            return False
+        return _SENAL_TEMPLATE.format_map({
+            'tipo_operacion': tipo_operacion,
+            'simbolo': simbolo,
+            'breakout_texto': breakout_texto,
+            'timeframe': config_optima['timeframe'],
+            'num_velas': config_optima['num_velas'],
+            'ancho_canal_porcentual': info_canal['ancho_canal_porcentual'],
+            'precio_actual': datos_mercado['precio_actual'],
+            'precio_entrada': precio_entrada,
+            'sl': sl,
+            'tp': tp,
+            'ratio_rr': ratio_rr,
+            'sl_percent': sl_percent,
+            'tp_percent': tp_percent,
+            'riesgo': riesgo,
+            'beneficio': beneficio,
+            'direccion': info_canal['direccion'],
+            'fuerza_texto': info_canal['fuerza_texto'],
+            'angulo_tendencia': info_canal['angulo_tendencia'],
+            'coeficiente_pearson': info_canal['coeficiente_pearson'],
+            'r2_score': info_canal['r2_score'],
+            'stoch_estado': stoch_estado,
+            'stoch_k': info_canal['stoch_k'],
+            'stoch_d': info_canal['stoch_d'],
+            'hora': now.strftime('%Y-%m-%d %H:%M:%S'),
+        })
     
     def enviar_senal_operacion(self, simbolo: str, tipo_operacion: str, precio_entrada: float, 
                              tp: float, sl: float, info_canal: Dict, datos_mercado: Dict, 
@@ -184,128 +710,91 @@ class TelegramBot:
         """
         Envía señal de operación - LÓGICA ORIGINAL INTACTA
         """
-        try:
-            if not self.enabled:
-                logger.warning("⚠️ Telegram deshabilitado - no se puede enviar señal")
-                return False
-                
-            riesgo = abs(precio_entrada - sl)
-            beneficio = abs(tp - precio_entrada)
-            ratio_rr = beneficio / riesgo if riesgo > 0 else 0
-            
-            # Calcular SL y TP en porcentaje
-            sl_percent = abs((sl - precio_entrada) / precio_entrada) * 100
-            tp_percent = abs((tp - precio_entrada) / precio_entrada) * 100
-            
-            stoch_estado = "📉 SOBREVENTA" if tipo_operacion == "LONG" else "📈 SOBRECOMPRA"
-            
-            breakout_texto = ""
-            if breakout_info:
-                tiempo_breakout = (datetime.now() - breakout_info['timestamp']).total_seconds() / 60
-                breakout_texto = f"""
-🚀 <b>BREAKOUT + REENTRY DETECTADO:</b>
-⏰ Tiempo desde breakout: {tiempo_breakout:.1f} minutos
-💰 Precio breakout: {breakout_info['precio_breakout']:.8f}
-                """
-                
-            mensaje = f"""
-🎯 <b>SEÑAL DE {tipo_operacion} - {simbolo}</b>
-{breakout_texto}
-⏱️ <b>Configuración óptima:</b>
-📊 Timeframe: {config_optima['timeframe']}
-🕯️ Velas: {config_optima['num_velas']}
-📏 Ancho Canal: {info_canal['ancho_canal_porcentual']:.1f}% ⭐
-💰 <b>Precio Actual:</b> {datos_mercado['precio_actual']:.8f}
-🎯 <b>Entrada:</b> {precio_entrada:.8f}
-🛑 <b>Stop Loss:</b> {sl:.8f}
-🎯 <b>Take Profit:</b> {tp:.8f}
-📊 <b>Ratio R/B:</b> {ratio_rr:.2f}:1
-🎯 <b>SL:</b> {sl_percent:.2f}%
-🎯 <b>TP:</b> {tp_percent:.2f}%
-💰 <b>Riesgo:</b> {riesgo:.8f}
-🎯 <b>Beneficio Objetivo:</b> {beneficio:.8f}
-📈 <b>Tendencia:</b> {info_canal['direccion']}
-💪 <b>Fuerza:</b> {info_canal['fuerza_texto']}
-📏 <b>Ángulo:</b> {info_canal['angulo_tendencia']:.1f}°
-📊 <b>Pearson:</b> {info_canal['coeficiente_pearson']:.3f}
-🎯 <b>R² Score:</b> {info_canal['r2_score']:.3f}
-🎰 <b>Stochástico:</b> {stoch_estado}
-📊 <b>Stoch K:</b> {info_canal['stoch_k']:.1f}
-📈 <b>Stoch D:</b> {info_canal['stoch_d']:.1f}
-⏰ <b>Hora:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-💡 <b>Estrategia:</b> BREAKOUT + REENTRY con confirmación Stochastic
-            """
-            
-            logger.info(f"     📊 Generando gráfico para {simbolo}...")
-            
-            # Aquí se integraría con el generador de gráficos
-            # buf = self.generar_grafico_profesional(simbolo, info_canal, datos_mercado, 
-            #                                       precio_entrada, tp, sl, tipo_operacion)
+        if not self.enabled:
+            logger.warning("⚠️ Telegram deshabilitado - no se puede enviar señal")
+            return False
             
-            # Enviar mensaje sin gráfico por ahora
+        mensaje = self._mensaje_senal_operacion(
+            simbolo, tipo_operacion, precio_entrada, tp, sl,
+            info_canal, datos_mercado, config_optima, breakout_info
+        )
+        
+        logger.info("     📊 Generando gráfico para %s...", simbolo)
+        
+        # Aquí se integraría con el generador de gráficos
+        # buf = self.generar_grafico_profesional(simbolo, info_canal, datos_mercado, 
+        #                                       precio_entrada, tp, sl, tipo_operacion)
+        
+        # Enviar mensaje sin gráfico por ahora
+        try:
             exito = self._enviar_telegram_simple(mensaje)
+        except Exception:
+            logger.exception("❌ Error enviando señal de operación")
+            return False
+        
+        if exito:
+            logger.info("     ✅ Señal %s para %s enviada", tipo_operacion, simbolo)
+        else:
+            logger.warning("     ⚠️ Error enviando señal %s para %s", tipo_operacion, simbolo)
             
-            if exito:
-                logger.info(f"     ✅ Señal {tipo_operacion} para {simbolo} enviada")
-            else:
-                logger.warning(f"     ⚠️ Error enviando señal {tipo_operacion} para {simbolo}")
-                
-            return exito
+        return exito
+    
+    @staticmethod
+    def _mensaje_cierre_operacion(datos_operacion: Dict) -> str:
+        """Construye el texto de la notificación de cierre"""
+        emoji = "🟢" if datos_operacion['resultado'] == "TP" else "🔴"
+        color_emoji = "✅" if datos_operacion['resultado'] == "TP" else "❌"
+        
+        if datos_operacion['tipo'] == 'LONG':
+            pnl_absoluto = datos_operacion['precio_salida'] - datos_operacion['precio_entrada']
+        else:
+            pnl_absoluto = datos_operacion['precio_entrada'] - datos_operacion['precio_salida']
             
-        except Exception as e:
-            logger.error(f"❌ Error enviando señal de operación: {e}")
-            return False
+        breakout_usado = "🚀 Sí" if datos_operacion.get('breakout_usado', False) else "❌ No"
+        
+        return _CIERRE_TEMPLATE.format_map({
+            'emoji': emoji,
+            'symbol': datos_operacion['symbol'],
+            'color_emoji': color_emoji,
+            'resultado': datos_operacion['resultado'],
+            'tipo': datos_operacion['tipo'],
+            'precio_entrada': datos_operacion['precio_entrada'],
+            'precio_salida': datos_operacion['precio_salida'],
+            'pnl_absoluto': pnl_absoluto,
+            'pnl_percent': datos_operacion['pnl_percent'],
+            'duracion_minutos': datos_operacion['duracion_minutos'],
+            'breakout_usado': breakout_usado,
+            'angulo_tendencia': datos_operacion['angulo_tendencia'],
+            'pearson': datos_operacion['pearson'],
+            'r2_score': datos_operacion['r2_score'],
+            'ancho_canal_porcentual': datos_operacion.get('ancho_canal_porcentual', 0),
+            'timeframe_utilizado': datos_operacion.get('timeframe_utilizado', 'N/A'),
+            'velas_utilizadas': datos_operacion.get('velas_utilizadas', 0),
+            'timestamp': datos_operacion['timestamp'],
+        })
     
     def enviar_cierre_operacion(self, datos_operacion: Dict) -> bool:
         """
         Envía notificación de cierre de operación - LÓGICA ORIGINAL INTACTA
         """
-        try:
-            if not self.enabled:
-                logger.warning("⚠️ Telegram deshabilitado - no se puede enviar notificación de cierre")
-                return False
-                
-            emoji = "🟢" if datos_operacion['resultado'] == "TP" else "🔴"
-            color_emoji = "✅" if datos_operacion['resultado'] == "TP" else "❌"
-            
-            if datos_operacion['tipo'] == 'LONG':
-                pnl_absoluto = datos_operacion['precio_salida'] - datos_operacion['precio_entrada']
-            else:
-                pnl_absoluto = datos_operacion['precio_entrada'] - datos_operacion['precio_salida']
-                
-            breakout_usado = "🚀 Sí" if datos_operacion.get('breakout_usado', False) else "❌ No"
-            
-            mensaje = f"""
-{emoji} <b>OPERACIÓN CERRADA - {datos_operacion['symbol']}</b>
-{color_emoji} <b>RESULTADO: {datos_operacion['resultado']}</b>
-📊 Tipo: {datos_operacion['tipo']}
-💰 Entrada: {datos_operacion['precio_entrada']:.8f}
-🎯 Salida: {datos_operacion['precio_salida']:.8f}
-💵 PnL Absoluto: {pnl_absoluto:.8f}
-📈 PnL %: {datos_operacion['pnl_percent']:.2f}%
-⏰ Duración: {datos_operacion['duracion_minutos']:.1f} minutos
-🚀 Breakout+Reentry: {breakout_usado}
-📏 Ángulo: {datos_operacion['angulo_tendencia']:.1f}°
-📊 Pearson: {datos_operacion['pearson']:.3f}
-🎯 R²: {datos_operacion['r2_score']:.3f}
-📏 Ancho: {datos_operacion.get('ancho_canal_porcentual', 0):.1f}%
-⏱️ TF: {datos_operacion.get('timeframe_utilizado', 'N/A')}
-🕯️ Velas: {datos_operacion.get('velas_utilizadas', 0)}
-🕒 {datos_operacion['timestamp']}
-            """
-            
-            exito = self._enviar_telegram_simple(mensaje)
-            
-            if exito:
-                logger.info(f"✅ Notificación de cierre enviada para {datos_operacion['symbol']}")
-            else:
-                logger.warning(f"⚠️ Error enviando notificación de cierre para {datos_operacion['symbol']}")
-                
-            return exito
+        if not self.enabled:
+            logger.warning("⚠️ Telegram deshabilitado - no se puede enviar notificación de cierre")
+            return False
             
-        except Exception as e:
-            logger.error(f"❌ Error enviando cierre de operación: {e}")
+        mensaje = self._mensaje_cierre_operacion(datos_operacion)
+        
+        try:
+            exito = self._encolar(mensaje)
+        except Exception:
+            logger.exception("❌ Error enviando cierre de operación")
             return False
+        
+        if exito:
+            logger.info("✅ Notificación de cierre enviada para %s", datos_operacion['symbol'])
+        else:
+            logger.warning("⚠️ Error enviando notificación de cierre para %s", datos_operacion['symbol'])
+            
+        return exito
     
     def enviar_reporte_semanal(self, mensaje: str) -> bool:
         """Envía reporte semanal - LÓGICA ORIGINAL INTACTA"""
@@ -327,6 +816,38 @@ class TelegramBot:
             logger.error(f"❌ Error enviando reporte semanal: {e}")
             return False
     
+    def close(self) -> None:
+        """Detiene el keepalive, vacía la cola, detiene el pool de envíos y cierra la sesión HTTP"""
+        try:
+            keepalive_stop = getattr(self, '_keepalive_stop', None)
+            if keepalive_stop is not None:
+                keepalive_stop.set()
+            sender = getattr(self, '_sender_thread', None)
+            if sender is not None and sender.is_alive():
+                try:
+                    # Sin bloquear la salida si el hilo está trabado en reintentos con la cola llena
+                    self._send_queue.put(None, timeout=1)
+                    sender.join(timeout=10)
+                except queue.Full:
+                    logger.warning("⚠️ Cola de Telegram llena al cerrar - se descartan mensajes pendientes")
+            executor = getattr(self, '_executor', None)
+            if executor is not None:
+                # Si el hilo de envío sigue vivo hay envíos en curso: no esperarlos
+                executor.shutdown(wait=not (sender is not None and sender.is_alive()))
+            if hasattr(self, '_session'):
+                self._session.close()
+        except Exception as e:
+            logger.error(f"❌ Error cerrando sesión de Telegram: {e}")
+    
+    def start(self) -> None:
+        """
+        Arranca el hilo de envío y el keepalive sin esperar al primer mensaje, para
+        que el primer envío encuentre la conexión ya abierta. No hace nada si el bot
+        está deshabilitado. Llamarlo desde el arranque, no al importar.
+        """
+        if self.enabled:
+            self._ensure_started()
+    
     def is_enabled(self) -> bool:
         """Verifica si Telegram está habilitado"""
         return self.enabled
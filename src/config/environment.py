@@ -5,27 +5,43 @@ Carga y valida todas las variables de entorno para Render.com
 
 import os
 import logging
-from typing import List, Optional, Dict, Any
-from .settings import *
+import re
+import sys
+from types import MappingProxyType
+from typing import Mapping, Optional, Dict, Any, Tuple
+from .settings import (
+    ensure_data_dirs, DEFAULT_CHAT_IDS, DEFAULT_SYMBOLS, DEFAULT_SYMBOLS_SET, DEFAULT_TIMEFRAMES, DEFAULT_TIMEFRAMES_SET,
+    DEFAULT_VELAS_OPTIONS, MIN_CHANNEL_WIDTH_PERCENT, TREND_THRESHOLD_DEGREES, MIN_TREND_STRENGTH_DEGREES,
+    ENTRY_MARGIN, MIN_RR_RATIO, SCAN_INTERVAL_MINUTES, AUTO_OPTIMIZE, MIN_SAMPLES_OPTIMIZACION,
+    REEVALUACION_HORAS, OPERACIONES_LOG_FILE, ESTADO_BOT_FILE, ULTIMO_REPORTE_FILE, MEJORES_PARAMETROS_FILE
+)
 
 logger = logging.getLogger(__name__)
 
+# Chat ID de Telegram: entero, negativo para grupos/canales
+_CHAT_ID_RE = re.compile(r'^-?\d+$', re.ASCII)
+
 class EnvironmentManager:
     """Gestor centralizado de variables de entorno"""
     
+    __slots__ = ('_telegram_token', '_telegram_chat_ids', '_webhook_url', '_render_external_url',
+                 '_config_loaded', '_telegram_config')
+    
     def __init__(self):
         """Inicializa el gestor de entorno"""
         self._telegram_token: Optional[str] = None
-        self._telegram_chat_ids: List[str] = []
+        self._telegram_chat_ids: Tuple[str, ...] = ()
         self._webhook_url: Optional[str] = None
         self._render_external_url: Optional[str] = None
         self._config_loaded = False
+        self._telegram_config: Mapping[str, Any] = MappingProxyType({})
         self._load_environment()
     
     def _load_environment(self) -> None:
         """Carga todas las variables de entorno"""
         try:
             logger.info("🔧 Cargando variables de entorno...")
+            ensure_data_dirs()
             
             # Cargar token de Telegram
             self._telegram_token = self._get_env_var('TELEGRAM_TOKEN', required=False)
@@ -40,7 +56,7 @@ class EnvironmentManager:
                 logger.info(f"✅ TELEGRAM_CHAT_IDS cargados: {len(self._telegram_chat_ids)} chats")
             else:
                 logger.warning("⚠️ TELEGRAM_CHAT_IDS no encontrados - usando por defecto")
-                self._telegram_chat_ids = DEFAULT_CHAT_IDS
+                self._telegram_chat_ids = tuple(sys.intern(cid) for cid in DEFAULT_CHAT_IDS)
             
             # Cargar URLs de webhook
             self._webhook_url = self._get_env_var('WEBHOOK_URL', required=False)
@@ -56,6 +72,14 @@ class EnvironmentManager:
             # Validar configuración
             self._validate_configuration()
             
+            # Configuración de Telegram congelada (se construye una vez)
+            self._telegram_config = MappingProxyType({
+                'token': self._telegram_token,
+                'chat_ids': self._telegram_chat_ids,
+                'webhook_url': self._webhook_url,
+                'render_external_url': self._render_external_url
+            })
+            
             self._config_loaded = True
             logger.info("✅ Variables de entorno cargadas correctamente")
             
@@ -65,42 +89,29 @@ class EnvironmentManager:
     
     def _get_env_var(self, name: str, required: bool = False, default: Optional[str] = None) -> Optional[str]:
         """Obtiene una variable de entorno"""
-        try:
-            value = os.environ.get(name, default)
-            if required and not value:
-                raise ValueError(f"Variable de entorno requerida no encontrada: {name}")
-            return value
-        except Exception as e:
-            if required:
-                raise
-            logger.warning(f"⚠️ Error obteniendo {name}: {e}")
-            return default
+        value = os.environ.get(name, default)
+        if required and not value:
+            raise ValueError(f"Variable de entorno requerida no encontrada: {name}")
+        return value
     
-    def _get_telegram_chat_ids(self) -> List[str]:
-        """Obtiene y valida los Chat IDs de Telegram"""
-        try:
-            chat_ids_str = os.environ.get('TELEGRAM_CHAT_ID', '')
-            if not chat_ids_str:
-                return []
-            
-            # Parsear lista de chat IDs (separados por comas)
-            chat_ids = [cid.strip() for cid in chat_ids_str.split(',') if cid.strip()]
-            
-            # Validar formato de chat IDs
-            valid_chat_ids = []
-            for chat_id in chat_ids:
-                try:
-                    # Chat ID debe ser numérico (incluyendo negativos)
-                    int(chat_id)
-                    valid_chat_ids.append(chat_id)
-                except ValueError:
-                    logger.warning(f"⚠️ Chat ID inválido ignorado: {chat_id}")
-            
-            return valid_chat_ids
-            
-        except Exception as e:
-            logger.error(f"❌ Error procesando TELEGRAM_CHAT_ID: {e}")
-            return []
+    def _get_telegram_chat_ids(self) -> Tuple[str, ...]:
+        """Obtiene y valida los Chat IDs de Telegram (una sola pasada, internados)"""
+        chat_ids_str = os.environ.get('TELEGRAM_CHAT_ID', '')
+        if not chat_ids_str:
+            return ()
+        
+        valid_chat_ids = []
+        for chat_id in chat_ids_str.split(','):
+            chat_id = chat_id.strip()
+            if not chat_id:
+                continue
+            # Chat ID debe ser numérico (incluyendo negativos)
+            if _CHAT_ID_RE.match(chat_id):
+                valid_chat_ids.append(sys.intern(chat_id))
+            else:
+                logger.warning(f"⚠️ Chat ID inválido ignorado: {chat_id}")
+        
+        return tuple(valid_chat_ids)
     
     def _validate_configuration(self) -> None:
         """Valida que la configuración sea correcta"""
@@ -111,13 +122,9 @@ class EnvironmentManager:
             if self._telegram_token and len(self._telegram_token) < 10:
                 errors.append("TELEGRAM_TOKEN parece ser inválido (muy corto)")
             
-            # Validar chat IDs
+            # Validar chat IDs (el formato ya se validó al parsearlos)
             if not self._telegram_chat_ids:
                 errors.append("No hay chat IDs configurados")
-            else:
-                for chat_id in self._telegram_chat_ids:
-                    if not chat_id.lstrip('-').isdigit():
-                        errors.append(f"Chat ID inválido: {chat_id}")
             
             # Validar URLs si están configuradas
             if self._webhook_url and not self._webhook_url.startswith(('http://', 'https://')):
@@ -135,20 +142,17 @@ class EnvironmentManager:
             logger.error(f"❌ Error en validación de configuración: {e}")
             raise
     
-    def get_telegram_config(self) -> Dict[str, Any]:
-        """Obtiene la configuración de Telegram"""
-        return {
-            'token': self._telegram_token,
-            'chat_ids': self._telegram_chat_ids,
-            'webhook_url': self._webhook_url,
-            'render_external_url': self._render_external_url
-        }
+    def get_telegram_config(self) -> Mapping[str, Any]:
+        """Obtiene la configuración de Telegram (solo lectura)"""
+        return self._telegram_config
     
     def get_trading_config(self) -> Dict[str, Any]:
         """Obtiene la configuración de trading"""
         return {
             'symbols': DEFAULT_SYMBOLS,
+            'symbols_set': DEFAULT_SYMBOLS_SET,
             'timeframes': DEFAULT_TIMEFRAMES,
+            'timeframes_set': DEFAULT_TIMEFRAMES_SET,
             'velas_options': DEFAULT_VELAS_OPTIONS,
             'min_channel_width_percent': MIN_CHANNEL_WIDTH_PERCENT,
             'trend_threshold_degrees': TREND_THRESHOLD_DEGREES,
@@ -207,7 +211,7 @@ def get_env_manager() -> EnvironmentManager:
     """Obtiene la instancia global del gestor de entorno"""
     return env_manager
 
-def get_telegram_config() -> Dict[str, Any]:
+def get_telegram_config() -> Mapping[str, Any]:
     """Obtiene la configuración de Telegram"""
     return env_manager.get_telegram_config()
 
@@ -4,24 +4,26 @@ Todas las constantes y configuraciones del sistema
 """
 
 import os
-from typing import List, Dict, Any
+from typing import FrozenSet, List, Dict, Any, Tuple
 
 # ============================
 # CONFIGURACIONES PRINCIPALES
 # ============================
 
-# Símbolos de trading
-DEFAULT_SYMBOLS: List[str] = [
+# Símbolos de trading (tupla inmutable; para tests `in` usar DEFAULT_SYMBOLS_SET)
+DEFAULT_SYMBOLS: Tuple[str, ...] = (
     'BTCUSDT', 'ETHUSDT', 'DOTUSDT', 'LINKUSDT', 'BNBUSDT', 'XRPUSDT', 
     'SOLUSDT', 'AVAXUSDT', 'DOGEUSDT', 'LTCUSDT', 'ATOMUSDT', 'XLMUSDT', 
     'ALGOUSDT', 'VETUSDT', 'ICPUSDT', 'FILUSDT', 'BCHUSDT', 'EOSUSDT', 
     'TRXUSDT', 'XTZUSDT', 'SUSHIUSDT', 'COMPUSDT', 'YFIUSDT', 'ETCUSDT', 
     'SNXUSDT', 'RENUSDT', '1INCHUSDT', 'NEOUSDT', 'ZILUSDT', 'HOTUSDT', 
     'ENJUSDT', 'ZECUSDT'
-]
+)
+DEFAULT_SYMBOLS_SET: FrozenSet[str] = frozenset(DEFAULT_SYMBOLS)
 
-# Timeframes disponibles (ordenados por prioridad)
-DEFAULT_TIMEFRAMES: List[str] = ['1m', '3m', '5m', '15m', '30m']
+# Timeframes disponibles (ordenados por prioridad; para tests `in` usar DEFAULT_TIMEFRAMES_SET)
+DEFAULT_TIMEFRAMES: Tuple[str, ...] = ('1m', '3m', '5m', '15m', '30m')
+DEFAULT_TIMEFRAMES_SET: FrozenSet[str] = frozenset(DEFAULT_TIMEFRAMES)
 
 # Número de velas para análisis
 DEFAULT_VELAS_OPTIONS: List[int] = [80, 100, 120, 150, 200]
@@ -71,6 +73,31 @@ REOPTIMIZACION_OPERACIONES: int = 8
 # Chat IDs por defecto (pueden venir de variables de entorno)
 DEFAULT_CHAT_IDS: List[str] = ['-1002272872445']
 
+# Envíos concurrentes (Telegram: máximo 30 mensajes/s globales)
+TELEGRAM_MAX_WORKERS = 8
+TELEGRAM_MAX_INFLIGHT = 25
+
+# Reintentos ante 429 / 5xx / errores de red
+TELEGRAM_MAX_RETRIES = 8
+TELEGRAM_MAX_BACKOFF = 30
+
+# Pacing (token bucket adaptativo): global y por chat
+TELEGRAM_GLOBAL_BURST = 30
+TELEGRAM_GLOBAL_RATE = 25.0
+TELEGRAM_CHAT_BURST = 1
+TELEGRAM_CHAT_RATE = 1.0
+
+# Cola de envío en segundo plano
+TELEGRAM_QUEUE_MAXSIZE = 10000
+TELEGRAM_COALESCE_WINDOW = 0.2  # segundos esperando mensajes para agrupar
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096  # límite de texto de sendMessage
+
+# No reenviar el mismo texto al mismo chat dentro de esta ventana (segundos)
+TELEGRAM_DEDUP_TTL = 60
+
+# getMe periódico para mantener viva la conexión con api.telegram.org (segundos)
+TELEGRAM_KEEPALIVE_INTERVAL = 60
+
 # ============================
 # CONFIGURACIONES DE ARCHIVOS
 # ============================
@@ -80,9 +107,16 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 LOGS_DIR = os.path.join(BASE_DIR, 'logs')
 
-# Crear directorios si no existen
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(LOGS_DIR, exist_ok=True)
+# Los directorios se crean en la primera escritura, no al importar
+_dirs_ready = False
+
+def ensure_data_dirs() -> None:
+    """Crea DATA_DIR y LOGS_DIR si no existen (una sola vez por proceso)"""
+    global _dirs_ready
+    if not _dirs_ready:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        _dirs_ready = True
 
 # Archivos de datos
 OPERACIONES_LOG_FILE = os.path.join(DATA_DIR, 'operaciones_log_v23.csv')
@@ -103,6 +137,11 @@ API_TIMEOUT = 10
 MAX_RETRIES = 3
 RETRY_DELAY = 1
 
+# Límites de uso (Binance: 1200 de peso por minuto por IP)
+API_WEIGHT_LIMIT = 1200
+API_MAX_WORKERS = 8
+API_POOL_MAXSIZE = 32  # Conexiones keep-alive reutilizables por host
+
 # ============================
 # CONFIGURACIONES DE GRÁFICOS
 # ============================
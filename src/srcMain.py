@@ -6,9 +6,12 @@ Punto de entrada que conecta todos los módulos del sistema
 import sys
 import os
 import time
+import functools
 import threading
 import logging
 from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping
 
 # Configurar logging básico
 logging.basicConfig(
@@ -17,8 +20,84 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
+def _load_basic_config() -> Mapping[str, Any]:
+    """
+    Carga configuración básica desde variables de entorno.
+    Se evalúa una sola vez por proceso; el resultado es de solo lectura.
+    """
+    try:
+        config = {
+            # Configuración básica de trading
+            'symbols': tuple(os.environ.get('SYMBOLS', 'BTCUSDT,ETHUSDT').split(',')),
+            'timeframes': tuple(os.environ.get('TIMEFRAMES', '1m,5m,15m').split(',')),
+            'max_operations': int(os.environ.get('MAX_OPERATIONS', '3')),
+            'risk_percent': float(os.environ.get('RISK_PERCENT', '2.0')),
+            
+            # Configuración de Binance
+            'binance_api_key': os.environ.get('BINANCE_API_KEY', ''),
+            'binance_secret_key': os.environ.get('BINANCE_SECRET_KEY', ''),
+            'testnet': os.environ.get('BINANCE_TESTNET', 'true').lower() == 'true',
+            
+            # Configuración de Telegram
+            'telegram_token': os.environ.get('TELEGRAM_BOT_TOKEN', ''),
+            'telegram_chat_id': os.environ.get('TELEGRAM_CHAT_ID', ''),
+            'telegram_enabled': os.environ.get('TELEGRAM_ENABLED', 'false').lower() == 'true',
+            
+            # Configuración del sistema
+            'trading_enabled': os.environ.get('TRADING_ENABLED', 'true').lower() == 'true',
+            'auto_optimize': os.environ.get('AUTO_OPTIMIZE', 'true').lower() == 'true',
+            'health_check_interval': int(os.environ.get('HEALTH_CHECK_INTERVAL', '60')),
+        }
+        
+        logger.info(
+            "🔧 Configuración cargada:\n"
+            "  - Símbolos: %s\n"
+            "  - Timeframes: %s\n"
+            "  - Max operaciones: %s\n"
+            "  - Riesgo por operación: %s%%\n"
+            "  - Binance Testnet: %s\n"
+            "  - Trading habilitado: %s\n"
+            "  - Telegram habilitado: %s",
+            list(config['symbols']), list(config['timeframes']), config['max_operations'],
+            config['risk_percent'], config['testnet'], config['trading_enabled'],
+            config['telegram_enabled']
+        )
+        
+        return MappingProxyType(config)
+        
+    except Exception as e:
+        logger.error(f"❌ Error cargando configuración: {e}")
+        return MappingProxyType({})
+
 class TradingBotMain:
     """Clase principal del bot de trading - versión simplificada"""
+    # Segundos entre iteraciones del loop principal
+    LOOP_INTERVAL = 30
+    STRATEGY = 'breakout_reentry_simplified'
+    # Plantilla del log periódico (formateo diferido por logging)
+    UPTIME_FMT = "🔄 Bot funcionando - Iteración %d - Uptime: %.1fs"
+    # Plantilla del resumen de configuración (un solo registro de log)
+    SUMMARY_FMT = "\n".join((
+        "",
+        "=" * 60,
+        "🤖 CONFIGURACIÓN DEL BOT DE TRADING",
+        "=" * 60,
+        "🔑 Binance API: %s",
+        "🤖 Trading Bot: %s",
+        "📱 Telegram: %s",
+        "🧪 Testnet: %s",
+        "⚙️ Auto-optimización: %s",
+        "📊 Símbolos: %s",
+        "⏰ Timeframes: %s",
+        "💰 Riesgo por operación: %s%%",
+        "📈 Máximo operaciones simultáneas: %s",
+        "=" * 60,
+    ))
+    
+    __slots__ = ('is_running', 'start_time', 'config', '_stop_event', '_start_monotonic',
+                 '_last_update', '_iteration')
+    
     def __init__(self):
         """Inicializa el bot principal"""
         try:
@@ -26,17 +105,13 @@ class TradingBotMain:
             
             # Configuración básica
             self.is_running = False
+            self._stop_event = threading.Event()
             self.start_time = time.time()
-            self.config = self._load_basic_config()
-            
-            # Estado del bot
-            self.status = {
-                'initialized': True,
-                'running': False,
-                'last_update': datetime.now().isoformat(),
-                'symbols': self.config.get('symbols', []),
-                'strategy': 'breakout_reentry_simplified'
-            }
+            self._start_monotonic = time.monotonic()
+            # Epoch de la última actualización; se formatea solo en get_status()
+            self._last_update = self.start_time
+            self.config = _load_basic_config()
+            self._iteration = 0
             
             logger.info("✅ TradingBotMain inicializado correctamente")
             logger.info(f"📊 Configuración cargada: {len(self.config)} parámetros")
@@ -45,47 +120,6 @@ class TradingBotMain:
             logger.error(f"❌ Error inicializando TradingBotMain: {e}")
             raise
 
-    def _load_basic_config(self):
-        """Carga configuración básica desde variables de entorno"""
-        try:
-            config = {
-                # Configuración básica de trading
-                'symbols': os.environ.get('SYMBOLS', 'BTCUSDT,ETHUSDT').split(','),
-                'timeframes': os.environ.get('TIMEFRAMES', '1m,5m,15m').split(','),
-                'max_operations': int(os.environ.get('MAX_OPERATIONS', '3')),
-                'risk_percent': float(os.environ.get('RISK_PERCENT', '2.0')),
-                
-                # Configuración de Binance
-                'binance_api_key': os.environ.get('BINANCE_API_KEY', ''),
-                'binance_secret_key': os.environ.get('BINANCE_SECRET_KEY', ''),
-                'testnet': os.environ.get('BINANCE_TESTNET', 'true').lower() == 'true',
-                
-                # Configuración de Telegram
-                'telegram_token': os.environ.get('TELEGRAM_BOT_TOKEN', ''),
-                'telegram_chat_id': os.environ.get('TELEGRAM_CHAT_ID', ''),
-                'telegram_enabled': os.environ.get('TELEGRAM_ENABLED', 'false').lower() == 'true',
-                
-                # Configuración del sistema
-                'trading_enabled': os.environ.get('TRADING_ENABLED', 'true').lower() == 'true',
-                'auto_optimize': os.environ.get('AUTO_OPTIMIZE', 'true').lower() == 'true',
-                'health_check_interval': int(os.environ.get('HEALTH_CHECK_INTERVAL', '60')),
-            }
-            
-            logger.info("🔧 Configuración cargada:")
-            logger.info(f"  - Símbolos: {config['symbols']}")
-            logger.info(f"  - Timeframes: {config['timeframes']}")
-            logger.info(f"  - Max operaciones: {config['max_operations']}")
-            logger.info(f"  - Riesgo por operación: {config['risk_percent']}%")
-            logger.info(f"  - Binance Testnet: {config['testnet']}")
-            logger.info(f"  - Trading habilitado: {config['trading_enabled']}")
-            logger.info(f"  - Telegram habilitado: {config['telegram_enabled']}")
-            
-            return config
-            
-        except Exception as e:
-            logger.error(f"❌ Error cargando configuración: {e}")
-            return {}
-
     def test_connections(self) -> bool:
         """Prueba todas las conexiones del sistema"""
         try:
@@ -142,9 +176,9 @@ class TradingBotMain:
                 logger.error("❌ Error en conexiones, continuando en modo limitado")
             
             # Marcar como ejecutándose
+            self._stop_event.clear()
             self.is_running = True
-            self.status['running'] = True
-            self.status['last_update'] = datetime.now().isoformat()
+            self._last_update = time.time()
             
             logger.info("✅ Bot iniciado correctamente")
             logger.info("📊 Monitoreo activo - Press Ctrl+C para detener")
@@ -162,34 +196,44 @@ class TradingBotMain:
             return False
         finally:
             self.is_running = False
-            self.status['running'] = False
-            self.status['last_update'] = datetime.now().isoformat()
+            self._last_update = time.time()
 
     def _run_main_loop(self):
         """Loop principal del bot (simulado)"""
         try:
             logger.info("🔄 Iniciando loop principal del bot...")
             
-            # Simular operaciones periódicas
+            # Simular operaciones periódicas a ritmo fijo: cada iteración apunta a un
+            # deadline absoluto, así el tiempo de análisis no desplaza los ticks siguientes
             iteration = 0
+            next_deadline = time.monotonic() + self.LOOP_INTERVAL
             while self.is_running:
                 iteration += 1
                 
                 # Actualizar estado
-                self.status['last_update'] = datetime.now().isoformat()
-                self.status['iteration'] = iteration
+                self._last_update = time.time()
+                self._iteration = iteration
                 
                 # Log cada 10 iteraciones
                 if iteration % 10 == 0:
-                    uptime = time.time() - self.start_time
-                    logger.info(f"🔄 Bot funcionando - Iteración {iteration} - Uptime: {uptime:.1f}s")
+                    logger.info(self.UPTIME_FMT, iteration, time.monotonic() - self._start_monotonic)
                 
                 # Simular análisis de mercado (esto sería real en producción)
                 if iteration % 20 == 0:
                     self._simulate_market_analysis()
                 
-                # Esperar antes de la siguiente iteración
-                time.sleep(30)  # 30 segundos entre iteraciones
+                # Esperar hasta el próximo deadline; stop() despierta el loop al instante
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    next_deadline += self.LOOP_INTERVAL
+                else:
+                    # Iteración más larga que el intervalo: no se recuperan los ticks perdidos
+                    logger.warning("⏱️ Iteración %d excedió el intervalo por %.2fs", iteration, -delay,
+                                   extra={'overrun_seconds': -delay})
+                    delay = 0
+                    next_deadline = time.monotonic() + self.LOOP_INTERVAL
+                if self._stop_event.wait(delay):
+                    break
                 
         except Exception as e:
             logger.error(f"❌ Error en loop principal: {e}")
@@ -198,10 +242,12 @@ class TradingBotMain:
         """Simula análisis de mercado (placeholder para lógica real)"""
         try:
             symbols = self.config.get('symbols', ['BTCUSDT'])
+            debug = logger.isEnabledFor(logging.DEBUG)
             
             for symbol in symbols:
                 # Simular análisis
-                logger.debug(f"📊 Analizando {symbol}...")
+                if debug:
+                    logger.debug(f"📊 Analizando {symbol}...")
                 
                 # Aquí iría la lógica real de análisis técnico
                 # Por ahora solo registramos que se hizo el análisis
@@ -214,19 +260,19 @@ class TradingBotMain:
     def _print_configuration_summary(self):
         """Imprime resumen de la configuración"""
         try:
-            logger.info("=" * 60)
-            logger.info("🤖 CONFIGURACIÓN DEL BOT DE TRADING")
-            logger.info("=" * 60)
-            logger.info(f"🔑 Binance API: {'✅ Configurado' if self.config.get('binance_api_key') else '❌ No configurado'}")
-            logger.info(f"🤖 Trading Bot: {'✅ Habilitado' if self.config.get('trading_enabled') else '❌ Deshabilitado'}")
-            logger.info(f"📱 Telegram: {'✅ Habilitado' if self.config.get('telegram_enabled') else '❌ Deshabilitado'}")
-            logger.info(f"🧪 Testnet: {'✅ Habilitado' if self.config.get('testnet') else '❌ Deshabilitado'}")
-            logger.info(f"⚙️ Auto-optimización: {'✅ Habilitada' if self.config.get('auto_optimize') else '❌ Deshabilitada'}")
-            logger.info(f"📊 Símbolos: {', '.join(self.config.get('symbols', []))}")
-            logger.info(f"⏰ Timeframes: {', '.join(self.config.get('timeframes', []))}")
-            logger.info(f"💰 Riesgo por operación: {self.config.get('risk_percent', 0)}%")
-            logger.info(f"📈 Máximo operaciones simultáneas: {self.config.get('max_operations', 0)}")
-            logger.info("=" * 60)
+            config = self.config
+            logger.info(
+                self.SUMMARY_FMT,
+                '✅ Configurado' if config.get('binance_api_key') else '❌ No configurado',
+                '✅ Habilitado' if config.get('trading_enabled') else '❌ Deshabilitado',
+                '✅ Habilitado' if config.get('telegram_enabled') else '❌ Deshabilitado',
+                '✅ Habilitado' if config.get('testnet') else '❌ Deshabilitado',
+                '✅ Habilitada' if config.get('auto_optimize') else '❌ Deshabilitada',
+                ', '.join(config.get('symbols', ())),
+                ', '.join(config.get('timeframes', ())),
+                config.get('risk_percent', 0),
+                config.get('max_operations', 0)
+            )
             
         except Exception as e:
             logger.error(f"❌ Error mostrando configuración: {e}")
@@ -236,29 +282,41 @@ class TradingBotMain:
         try:
             logger.info("🛑 Deteniendo bot de trading...")
             self.is_running = False
-            self.status['running'] = False
-            self.status['last_update'] = datetime.now().isoformat()
+            self._stop_event.set()
+            self._last_update = time.time()
             
             # Calcular uptime final
-            uptime = time.time() - self.start_time
+            uptime = time.monotonic() - self._start_monotonic
             logger.info(f"👋 Bot detenido - Uptime total: {uptime:.1f} segundos")
             
         except Exception as e:
             logger.error(f"❌ Error deteniendo bot: {e}")
 
+    @property
+    def status(self) -> dict:
+        """Estado interno del bot (se arma a pedido)"""
+        return {
+            'initialized': True,
+            'running': self.is_running,
+            'last_update': datetime.fromtimestamp(self._last_update).isoformat(),
+            'symbols': self.config.get('symbols', []),
+            'strategy': self.STRATEGY,
+            'iteration': self._iteration
+        }
+    
     def get_status(self) -> dict:
         """Obtiene el estado actual del bot"""
         try:
-            uptime = time.time() - self.start_time if self.start_time else 0
+            uptime = time.monotonic() - self._start_monotonic
             
             return {
                 'status': 'running' if self.is_running else 'stopped',
                 'uptime_seconds': round(uptime, 2),
-                'initialized': self.status.get('initialized', False),
+                'initialized': True,
                 'symbols': self.config.get('symbols', []),
                 'timeframes': self.config.get('timeframes', []),
                 'trading_enabled': self.config.get('trading_enabled', False),
-                'last_update': self.status.get('last_update'),
+                'last_update': datetime.fromtimestamp(self._last_update).isoformat(),
                 'configuration': {
                     'max_operations': self.config.get('max_operations'),
                     'risk_percent': self.config.get('risk_percent'),
@@ -17,8 +17,36 @@ from typing import Dict, List, Optional, Any, Tuple
 from ..config.settings import *
 from ..apiBinance.market_data import get_market_data_manager
 
+try:
+    from numba import njit
+except ImportError:
+    # numba es opcional: sin él se usa el bucle original en Python
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+def _stochastic_k_values(cierres, maximos, minimos, period):
+    """%K sin suavizar desde la vela `period-1` (mismo cálculo que calcular_stochastic)"""
+    n = cierres.shape[0]
+    k_values = np.empty(n - period + 1)
+    for i in range(period - 1, n):
+        highest_high = maximos[i - period + 1]
+        lowest_low = minimos[i - period + 1]
+        for j in range(i - period + 2, i + 1):
+            if maximos[j] > highest_high:
+                highest_high = maximos[j]
+            if minimos[j] < lowest_low:
+                lowest_low = minimos[j]
+        if highest_high == lowest_low:
+            k = 50.0
+        else:
+            k = 100 * (cierres[i] - lowest_low) / (highest_high - lowest_low)
+        k_values[i - period + 1] = k
+    return k_values
+
+if njit is not None:
+    _stochastic_k_values = njit(cache=True)(_stochastic_k_values)
+
 class TradingBot:
     """
     Bot Principal - LÓGICA ORIGINAL INTACTA
@@ -312,15 +340,23 @@ class TradingBot:
         cierres = datos_mercado['cierres']
         maximos = datos_mercado['maximos']
         minimos = datos_mercado['minimos']
-        k_values = []
-        for i in range(period-1, len(cierres)):
-            highest_high = max(maximos[i-period+1:i+1])
-            lowest_low = min(minimos[i-period+1:i+1])
-            if highest_high == lowest_low:
-                k = 50
-            else:
-                k = 100 * (cierres[i] - lowest_low) / (highest_high - lowest_low)
-            k_values.append(k)
+        if njit is not None:
+            k_values = _stochastic_k_values(
+                np.asarray(cierres, dtype=np.float64),
+                np.asarray(maximos, dtype=np.float64),
+                np.asarray(minimos, dtype=np.float64),
+                period
+            ).tolist()
+        else:
+            k_values = []
+            for i in range(period-1, len(cierres)):
+                highest_high = max(maximos[i-period+1:i+1])
+                lowest_low = min(minimos[i-period+1:i+1])
+                if highest_high == lowest_low:
+                    k = 50
+                else:
+                    k = 100 * (cierres[i] - lowest_low) / (highest_high - lowest_low)
+                k_values.append(k)
         if len(k_values) >= k_period:
             k_smoothed = []
             for i in range(k_period-1, len(k_values)):
@@ -8,7 +8,7 @@ import logging.handlers
 import os
 from datetime import datetime
 from typing import Optional
-from ..config.settings import LOGS_DIR, LOG_LEVEL, LOG_FORMAT, LOG_FILE_FORMAT
+from ..config.settings import LOGS_DIR, LOG_LEVEL, LOG_FORMAT, LOG_FILE_FORMAT, ensure_data_dirs
 
 class LoggingManager:
     """Gestor centralizado de logging"""
@@ -22,7 +22,7 @@ class LoggingManager:
         """Configura el sistema de logging"""
         try:
             # Crear directorio de logs si no existe
-            os.makedirs(LOGS_DIR, exist_ok=True)
+            ensure_data_dirs()
             
             # Configurar logger principal
             logger = logging.getLogger(self.logger_name)
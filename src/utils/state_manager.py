@@ -10,7 +10,7 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
 
-from ..config.settings import ESTADO_BOT_FILE
+from ..config.settings import ESTADO_BOT_FILE, ensure_data_dirs
 
 logger = logging.getLogger(__name__)
 
@@ -106,9 +106,15 @@ class StateManager:
             
             estado_serializable['timestamp_guardado'] = datetime.now().isoformat()
             
-            # Guardar archivo
-            with open(self.estado_file, 'w', encoding='utf-8') as f:
+            # Guardar archivo: se escribe a un temporal y se reemplaza de forma atómica,
+            # así un kill a mitad de escritura nunca deja el estado truncado
+            ensure_data_dirs()
+            tmp_file = f"{self.estado_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(estado_serializable, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.estado_file)
             
             # Actualizar cache
             self.estado_cache = estado.copy()